@@ -1,9 +1,26 @@
 import logging
-
-import fire
+import sys
 
 from fontmod.main import main
 
-if __name__ == "__main__":
+
+def cli(argv: list[str] | None = None):
+    """
+    命令行入口，`python -m fontmod` 和 `fontmod` 脚本共用。
+    """
+    import fire
+
+    from fontmod.profiling import profile
+
+    if argv is None:
+        argv = sys.argv[1:]
     logging.basicConfig(level=logging.INFO)
-    fire.Fire(main)
+    # 不带子命令时运行演示，保持 `fontmod [--stats]` 的用法不变
+    if argv and argv[0] in ("demo", "profile"):
+        fire.Fire({"demo": main, "profile": profile}, command=argv)
+    else:
+        fire.Fire(main, command=argv)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,162 @@
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Callable, Iterable
+from weakref import WeakKeyDictionary
+
+from fontmod.context import FontContext
+from fontmod.info import FontInfo
+from fontmod.picker import (
+    FontRun,
+    _dispatch_for,
+    _dispatch_ready,
+    _resolve_style,
+    fz_encode_character_with_system_font,
+    fz_encode_string_with_system_font,
+    load_system_text_font,
+)
+from fontmod.script import script_of
+
+# asyncio 版本的解析入口：先在 executor 里把需要的字体加载好 (会阻塞的部分)，
+# 再在事件循环里同步解析；所需字体都已加载时整个调用不会挂起。
+# 默认 executor 是多线程的：thread_safe=True 的 FontContext 上各加载并发执行，
+# 其他 FontContext 上的加载按 ctx 串行，同一时刻最多一个 executor 线程在修改它。
+
+# 每个事件循环上进行中的加载：(id(ctx), key) -> Future，同一加载的并发等待者共享结果
+_pending: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, asyncio.Future]] = (
+    WeakKeyDictionary()
+)
+# 每个事件循环上非线程安全 ctx 的加载锁 (asyncio.Lock 只能在一个事件循环中使用)
+_locks: WeakKeyDictionary[
+    asyncio.AbstractEventLoop, WeakKeyDictionary[FontContext, asyncio.Lock]
+] = WeakKeyDictionary()
+
+
+async def _run(ctx: FontContext, load: Callable[[], object], executor: Executor | None):
+    loop = asyncio.get_running_loop()
+    if ctx.thread_safe:
+        return await loop.run_in_executor(executor, load)
+    locks = _locks.setdefault(loop, WeakKeyDictionary())
+    lock = locks.get(ctx)
+    if lock is None:
+        lock = locks[ctx] = asyncio.Lock()
+    async with lock:
+        return await loop.run_in_executor(executor, load)
+
+
+def _offload(
+    ctx: FontContext, key: tuple, load: Callable[[], object], executor: Executor | None
+) -> asyncio.Future:
+    loop = asyncio.get_running_loop()
+    pending = _pending.setdefault(loop, {})
+    flight_key = (id(ctx), key)
+    future = pending.get(flight_key)
+    if future is None:
+        future = loop.create_task(_run(ctx, load, executor))
+        pending[flight_key] = future
+        future.add_done_callback(lambda _: pending.pop(flight_key, None))
+    # shield：某个等待者被取消时不影响其他等待者
+    return asyncio.shield(future)
+
+
+async def _prepare(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    codepoints: Iterable[int],
+    is_serif: bool,
+    is_italic: bool,
+    is_bold: bool,
+    executor: Executor | None,
+):
+    """
+    把解析 `codepoints` 需要的字体加载好：用户字体的 cmap、各脚本字体、槽位分派表。
+    """
+    if user_font is not None and not user_font.coverage_loaded:
+        await _offload(
+            ctx, ("coverage", id(user_font)), lambda: user_font.coverage, executor
+        )
+
+    needed: list[tuple[int, str]] = []
+    for cp in codepoints:
+        if user_font is not None and user_font.contains(cp):
+            continue
+        if ctx.is_negative(("cp", cp, is_serif, is_bold, is_italic)):
+            continue
+        needed.append((cp, script_of(cp)))
+    if not needed:
+        return
+
+    scripts = {
+        script
+        for _, script in needed
+        if script not in ctx.fallback
+        and not ctx.is_negative(("script", script, is_serif, is_bold, is_italic))
+    }
+    if scripts:
+        await asyncio.gather(
+            *(
+                _offload(
+                    ctx,
+                    ("script", script, is_serif, is_bold, is_italic),
+                    partial(
+                        load_system_text_font, ctx, script, is_serif, is_bold, is_italic
+                    ),
+                    executor,
+                )
+                for script in sorted(scripts)
+            )
+        )
+
+    for cp, script in needed:
+        font = ctx.fallback.get(script)
+        if font is not None and font.contains(cp):
+            continue
+        dispatch = ctx.current_dispatch()
+        if dispatch is None or not _dispatch_ready(dispatch, cp):  # type: ignore
+            await _offload(
+                ctx, ("dispatch", cp), partial(_dispatch_for, ctx, cp), executor
+            )
+
+
+async def encode_character_with_system_font(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    unicode: int,
+    is_serif: bool | None = None,
+    is_italic: bool | None = None,
+    is_bold: bool | None = None,
+    executor: Executor | None = None,
+) -> tuple[FontInfo, int] | None:
+    """
+    fz_encode_character_with_system_font 的 async 版本，字体加载放到 `executor` 里执行。
+    """
+    is_serif, is_italic, is_bold = _resolve_style(
+        user_font, is_serif, is_italic, is_bold
+    )
+    await _prepare(ctx, user_font, (unicode,), is_serif, is_italic, is_bold, executor)
+    return fz_encode_character_with_system_font(
+        ctx, user_font, unicode, is_serif, is_italic, is_bold
+    )
+
+
+async def encode_string_with_system_font(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    text: str,
+    is_serif: bool | None = None,
+    is_italic: bool | None = None,
+    is_bold: bool | None = None,
+    executor: Executor | None = None,
+) -> list[FontRun]:
+    """
+    fz_encode_string_with_system_font 的 async 版本，字体加载放到 `executor` 里执行。
+    """
+    is_serif, is_italic, is_bold = _resolve_style(
+        user_font, is_serif, is_italic, is_bold
+    )
+    await _prepare(
+        ctx, user_font, {ord(ch) for ch in text}, is_serif, is_italic, is_bold, executor
+    )
+    return fz_encode_string_with_system_font(
+        ctx, user_font, text, is_serif, is_italic, is_bold
+    )
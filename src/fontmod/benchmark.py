@@ -0,0 +1,355 @@
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Iterable
+
+from fontmod.script import script_of
+
+
+def bench_script_lookup(count: int = 100_000, repeat: int = 5, seed: int = 0):
+    """
+    对比 script_of 与 fontTools.unicodedata.script 的逐码位查询耗时 (ns/码位)。
+    """
+    import fontTools.unicodedata
+
+    rng = random.Random(seed)
+    # 大部分落在 BMP，少量落在辅助平面，接近真实文本的分布
+    cps = [
+        rng.randrange(0x10000) if rng.random() < 0.9 else rng.randrange(0x110000)
+        for _ in range(count)
+    ]
+    script_of(0)  # 预先构建查找表，不计入查询耗时
+
+    def run(fn):
+        best = min(
+            timeit.repeat(lambda: [fn(cp) for cp in cps], number=1, repeat=repeat)
+        )
+        return best / count * 1e9
+
+    return {
+        "fontTools_ns": run(fontTools.unicodedata.script),
+        "script_of_ns": run(script_of),
+    }
+
+
+# 这些模块导入很慢，只 import fontmod 或从热索引查询时不应该被加载
+HEAVY_MODULES = ("fontTools", "fire", "numpy")
+
+
+def bench_import_time(
+    module: str = "fontmod.picker", budget_ms: float = 150.0, repeat: int = 3
+):
+    """
+    用 `python -X importtime` 在子进程里测量导入 `module` 的累计耗时 (取多次最小值)，
+    并检查是否带入了 HEAVY_MODULES。
+    """
+    best_us = None
+    loaded: set[str] = set()
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in proc.stderr.splitlines():
+            # 格式: "import time: self [us] | cumulative | imported package"
+            if not line.startswith("import time:"):
+                continue
+            fields = line[len("import time:") :].split("|")
+            if len(fields) != 3 or not fields[1].strip().isdigit():
+                continue
+            name = fields[2].strip()
+            if name.split(".")[0] in HEAVY_MODULES:
+                loaded.add(name.split(".")[0])
+            if name == module:
+                cumulative = int(fields[1])
+                best_us = cumulative if best_us is None else min(best_us, cumulative)
+
+    import_ms = (best_us or 0) / 1000
+    return {
+        "module": module,
+        "import_ms": import_ms,
+        "budget_ms": budget_ms,
+        "heavy_modules": sorted(loaded),
+        "ok": import_ms <= budget_ms and not loaded,
+    }
+
+
+def _best(fn, repeat: int) -> float:
+    """
+    运行 `fn` `repeat` 次，返回最短耗时 (秒)。
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位是 KiB，macOS 上是字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def bench_enumerator(dirs: Iterable[str | Path] | None = None, repeat: int = 3):
+    """
+    FontEnumerator 的冷启动 (无缓存、需解析字体) 与热启动 (读缓存) 耗时。
+    """
+    from fontmod.enumerator import FontEnumerator
+    from fontmod.info import clear_caches
+
+    dirs = None if dirs is None else [Path(d) for d in dirs]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "fonts.cache"
+
+        def cold():
+            clear_caches()
+            cache_path.unlink(missing_ok=True)
+            FontEnumerator(dirs=dirs, cache_path=cache_path)
+
+        def warm():
+            clear_caches()
+            FontEnumerator(dirs=dirs, cache_path=cache_path)
+
+        cold_s = _best(cold, repeat)
+        warm_s = _best(warm, repeat)
+        fonts = len(FontEnumerator(dirs=dirs, cache_path=cache_path).font_records)
+    return {"fonts": fonts, "cold_s": cold_s, "warm_s": warm_s}
+
+
+# 按体积分类的代表字体：CJK 字体覆盖 U+4E00，TTC 按扩展名判断
+SIZE_CLASSES = ("latin", "cjk", "ttc")
+
+
+def _size_class_samples(dirs: list[Path] | None) -> dict[str, Path]:
+    from fontmod.enumerator import FontEnumerator
+
+    fe = FontEnumerator(dirs=dirs, use_cache=False)
+    cjk = {r.path for r in fe.fonts_for_codepoint(0x4E00)}
+    samples: dict[str, Path] = {}
+    # 每类取体积最大的文件，代表该类的最坏情况
+    for path in sorted(fe.path_to_records, key=lambda p: p.stat().st_size):
+        if path.suffix.lower() in {".ttc", ".otc"}:
+            samples["ttc"] = path
+        elif path in cjk:
+            samples["cjk"] = path
+        else:
+            samples["latin"] = path
+    return samples
+
+
+def bench_font_load(dirs: Iterable[str | Path] | None = None, repeat: int = 5):
+    """
+    每个体积类别 (Latin / CJK / TTC) 的 FontInfo.load 耗时，区分 lazy 与完整加载。
+    没有对应字体的类别记为 None。
+    """
+    from fontmod.info import FontInfo, clear_caches
+
+    samples = _size_class_samples(None if dirs is None else [Path(d) for d in dirs])
+    results: dict[str, dict | None] = {}
+    for size_class in SIZE_CLASSES:
+        path = samples.get(size_class)
+        if path is None:
+            results[size_class] = None
+            continue
+
+        def load(lazy: bool):
+            clear_caches()
+            info = FontInfo.load(path, lazy=lazy)
+            info.name  # noqa: B018
+
+        results[size_class] = {
+            "path": str(path),
+            "bytes": path.stat().st_size,
+            "lazy_ms": _best(lambda: load(True), repeat) * 1e3,
+            "full_ms": _best(lambda: load(False), repeat) * 1e3,
+        }
+    return results
+
+
+def bench_resolution(repeat: int = 5):
+    """
+    在 WORDS 语料上测量逐码位与整串解析的吞吐 (ns/码位)。
+    first_pass_s 是新 FontContext 第一次解析全部语料的耗时 (包括加载系统字体)，
+    其后分别测 memo 命中、关闭 memo 以及整串解析。
+    """
+    from fontmod.context import FontContext
+    from fontmod.main import WORDS
+    from fontmod.picker import (
+        fz_encode_character_with_system_font,
+        fz_encode_string_with_system_font,
+    )
+
+    texts = [word for _, word in WORDS]
+    cps = [ord(ch) for text in texts for ch in text]
+
+    ctx = FontContext()
+
+    def chars():
+        for cp in cps:
+            fz_encode_character_with_system_font(ctx, None, cp)
+
+    def strings():
+        for text in texts:
+            fz_encode_string_with_system_font(ctx, None, text)
+
+    first_pass_s = _best(chars, 1)
+    memo_ns = _best(chars, repeat) / len(cps) * 1e9
+    memo_size = ctx.memo_size
+    ctx.memo_size = 0
+    ctx.clear_memo()
+    no_memo_ns = _best(chars, repeat) / len(cps) * 1e9
+    ctx.memo_size = memo_size
+    string_ns = _best(strings, repeat) / len(cps) * 1e9
+    return {
+        "codepoints": len(cps),
+        "first_pass_s": first_pass_s,
+        "char_memo_ns": memo_ns,
+        "char_no_memo_ns": no_memo_ns,
+        "string_ns": string_ns,
+    }
+
+
+def _bench_unix_backend(root: Path, texts: list[str]) -> dict | None:
+    """
+    把 unix 后端的字体目录临时指向 `root`，测量文件索引构建和 WORDS 首轮解析耗时。
+    """
+    if sys.platform == "win32":
+        return None
+    from fontmod.context import FontContext
+    from fontmod.picker import fz_encode_string_with_system_font
+    from fontmod.platform import unix
+
+    font_dirs = unix._font_dirs
+    unix._font_dirs = [root]
+    unix._reset_font_index()
+    try:
+        index_s = _best(lambda: (unix._reset_font_index(), unix._font_index()), 1)
+        ctx = FontContext()
+        start = time.perf_counter()
+        for text in texts:
+            fz_encode_string_with_system_font(ctx, None, text)
+        resolve_s = time.perf_counter() - start
+    finally:
+        unix._font_dirs = font_dirs
+        unix._reset_font_index()
+    return {"file_index_s": index_s, "first_pass_s": resolve_s}
+
+
+def bench_scaling(
+    counts: Iterable[int] = (10, 1000, 50_000),
+    cmap_size: int = 256,
+    workers: int | None = None,
+):
+    """
+    在 10 / 1,000 / 50,000 个合成字体上测量枚举、索引、查询和平台后端的耗时，
+    观察它们随字体数量如何增长。生成 50,000 个字体本身需要几分钟。
+    """
+    from fontmod.enumerator import FontEnumerator
+    from fontmod.info import clear_caches
+    from fontmod.main import WORDS
+    from fontmod.synthetic import generate_corpus
+
+    texts = [word for _, word in WORDS]
+    cps = sorted({ord(ch) for text in texts for ch in text})
+    results = {}
+    for count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "fonts"
+            start = time.perf_counter()
+            generate_corpus(root, count, cmap_size=cmap_size)
+            generate_s = time.perf_counter() - start
+
+            cache_path = Path(tmp) / "fonts.cache"
+            clear_caches()
+            start = time.perf_counter()
+            FontEnumerator(dirs=[root], cache_path=cache_path, workers=workers)
+            cold_s = time.perf_counter() - start
+
+            clear_caches()
+            start = time.perf_counter()
+            fe = FontEnumerator(dirs=[root], cache_path=cache_path)
+            warm_s = time.perf_counter() - start
+
+            index_s = _best(lambda: fe.index, 1)
+            query_s = _best(lambda: [fe.fonts_for_codepoint(cp) for cp in cps], 3)
+            rescan_s = _best(fe.rescan, 3)
+
+            logging.info(f"Benchmarked {count} synthetic fonts")
+            results[str(count)] = {
+                "faces": len(fe.font_records),
+                "generate_s": generate_s,
+                "enumerate_cold_s": cold_s,
+                "enumerate_warm_s": warm_s,
+                "index_build_s": index_s,
+                "query_ns": query_s / len(cps) * 1e9,
+                "rescan_s": rescan_s,
+                "unix_backend": _bench_unix_backend(root, texts),
+            }
+    return results
+
+
+def run_all(
+    output: str | None = None,
+    dirs: Iterable[str | Path] | None = None,
+    repeat: int = 3,
+):
+    """
+    运行全部基准，结果写入 `output` (JSON)，便于在同一台机器上比较不同版本。
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        fontmod_version = version("fontmod")
+    except PackageNotFoundError:
+        fontmod_version = None
+
+    dirs = None if dirs is None else [str(d) for d in dirs]
+    results = {
+        "fontmod": fontmod_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "import": bench_import_time(repeat=repeat),
+        "enumerator": bench_enumerator(dirs, repeat),
+        "font_load": bench_font_load(dirs, repeat),
+        "resolution": bench_resolution(repeat),
+        "script_lookup": bench_script_lookup(repeat=repeat),
+    }
+    # 最后读取，覆盖以上全部阶段
+    results["peak_rss_bytes"] = peak_rss_bytes()
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        logging.info(f"Wrote benchmark results to {output}")
+    return results
+
+
+if __name__ == "__main__":
+    import fire
+
+    logging.basicConfig(level=logging.INFO)
+    fire.Fire(
+        {
+            "all": run_all,
+            "imports": bench_import_time,
+            "enumerator": bench_enumerator,
+            "load": bench_font_load,
+            "resolution": bench_resolution,
+            "script": bench_script_lookup,
+            "scaling": bench_scaling,
+        }
+    )
@@ -0,0 +1,145 @@
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from fontmod.info import FontInfo
+
+# 缓存格式变化时递增，旧版本的缓存文件会被直接丢弃
+CACHE_VERSION = 4
+
+
+def default_cache_path() -> Path:
+    env = os.environ.get("FONTMOD_CACHE_DIR")
+    if env:
+        base = Path(env)
+    elif sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "fontmod"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+        base = base / "fontmod"
+    return base / "fonts.cache"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    size: int
+    mtime_ns: int
+    # 文件中的所有 face；解析失败的文件记为空，避免每次启动都重新解析
+    faces: tuple[FontInfo, ...]
+
+
+def _entry_to_tuple(entry: CacheEntry) -> tuple:
+    faces = [
+        # cmap 可能还没解码 (lazy)，此时只保存元数据；
+        # 同一集合内共享的 Coverage 由 pickle 自动去重
+        (
+            info.name,
+            info.is_bold,
+            info.is_italic,
+            info.is_serif,
+            info.font_number,
+            info._coverage,
+        )
+        for info in entry.faces
+    ]
+    return (entry.size, entry.mtime_ns, faces)
+
+
+def _entry_from_tuple(path: Path, data: tuple) -> CacheEntry:
+    size, mtime_ns, faces = data
+    infos = tuple(
+        FontInfo(
+            name=name,
+            path=path,
+            is_bold=is_bold,
+            is_italic=is_italic,
+            is_serif=is_serif,
+            font_number=font_number,
+            _coverage=coverage,
+        )
+        for name, is_bold, is_italic, is_serif, font_number, coverage in faces
+    )
+    return CacheEntry(size, mtime_ns, infos)
+
+
+class FontCache:
+    """
+    按文件 (size, mtime) 失效的持久化字体索引。
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries: dict[Path, CacheEntry] = {}
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f"Failed to read font cache {self.path}: {e}")
+            return
+
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            logging.info(f"Ignoring outdated font cache {self.path}")
+            self.dirty = True
+            return
+
+        for key, value in data["fonts"].items():
+            path = Path(key)
+            self.entries[path] = _entry_from_tuple(path, value)
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {
+            "version": CACHE_VERSION,
+            "fonts": {
+                str(path): _entry_to_tuple(entry)
+                for path, entry in self.entries.items()
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，避免并发进程读到半个文件
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except Exception as e:
+            logging.warning(f"Failed to write font cache {self.path}: {e}")
+
+    def get(self, path: Path, st: os.stat_result) -> CacheEntry | None:
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        if entry.size != st.st_size or entry.mtime_ns != st.st_mtime_ns:
+            return None
+        return entry
+
+    def put(self, path: Path, st: os.stat_result, faces: tuple[FontInfo, ...]):
+        self.entries[path] = CacheEntry(st.st_size, st.st_mtime_ns, faces)
+        self.dirty = True
+
+    def discard(self, path: Path):
+        if self.entries.pop(path, None) is not None:
+            self.dirty = True
+
+    def prune(self, dirs: set[Path], seen: set[Path]):
+        # 只清理本次扫描过的目录下已删除的文件，其他目录的记录保留
+        stale = [
+            path
+            for path in self.entries
+            if path not in seen and any(path.is_relative_to(d) for d in dirs)
+        ]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self.dirty = True
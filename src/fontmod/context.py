@@ -1,8 +1,82 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar
+
 from fontmod.info import FontInfo
 
+# memo_get 未命中时的返回值 (None 本身是合法的缓存结果：无字体可用)
+MISS = object()
+
+# 脚本字体之后依次尝试的槽位
+SLOTS = ("boxes", "emoji", "math", "music", "symbol1", "symbol2")
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """
+    一次进行中的加载：后到的线程等待 done，再读取领头线程的结果。
+    """
+
+    __slots__ = ("done", "result", "error")
 
-class FontContext:
     def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class _Slot:
+    """
+    槽位属性：赋值时让按页分派表和解析结果缓存失效，下次查询时重建。
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.attr = self.storage(name)
+
+    @staticmethod
+    def storage(name: str) -> str:
+        # 槽位字体实际保存在实例 __dict__ 中的键
+        return f"_{name}"
+
+    def __get__(self, ctx: "FontContext | None", owner=None):
+        if ctx is None:
+            return self
+        return ctx.__dict__.get(self.attr)
+
+    def __set__(self, ctx: "FontContext", font: FontInfo | None):
+        if ctx.__dict__.get(self.attr) is font:
+            return
+        # 与 invalidate 相同：换上新的 memo 而不是原地清空，一次 update 发布，
+        # 不会与并发的 memo_put / move_to_end 操作同一个 OrderedDict
+        updates: dict[str, object] = {self.attr: font, "dispatch": None}
+        if "memo" in ctx.__dict__:  # __init__ 中 memo 还没创建
+            updates["memo"] = OrderedDict()
+        ctx.__dict__.update(updates)
+
+
+class FontContext:
+    boxes = _Slot()
+    emoji = _Slot()
+    math = _Slot()
+    music = _Slot()
+    symbol1 = _Slot()
+    symbol2 = _Slot()
+
+    def __init__(
+        self,
+        memo_size: int = 4096,
+        negative_ttl: float | None = None,
+        thread_safe: bool = False,
+    ):
+        # thread_safe=True 时可在多个线程间共享：同一 key 的并发加载只执行一次 (single-flight)，
+        # memo 写入加锁；加载完成后的读取 (槽位、fallback、memo 命中) 仍然不加锁
+        self._lock = threading.Lock() if thread_safe else None
+        self._flights: dict[tuple, _Flight] = {}
+
         self.fallback: dict[str, FontInfo] = {}
         self.boxes: FontInfo | None = None
         self.emoji: FontInfo | None = None
@@ -10,3 +84,145 @@ class FontContext:
         self.music: FontInfo | None = None
         self.symbol1: FontInfo | None = None
         self.symbol2: FontInfo | None = None
+        # 页号 (cp >> 8) -> 按回退顺序排列、在该页有覆盖的槽位字体；按需逐个加入槽位，见 picker._Dispatch
+        self.dispatch: dict[int, tuple[FontInfo, ...]] | None = None
+        # 分派表已加载的槽位中缺失的那些最早过期的负缓存时间，过期后分派表需要重建
+        self.dispatch_expires = math.inf
+
+        # (user_font id, cp, serif, bold, italic) -> (user_font, 解析结果) 的 LRU
+        self.memo_size = memo_size
+        self.memo: OrderedDict[tuple, tuple] = OrderedDict()
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+        # 负缓存：("script", s, serif, bold, italic) / ("slot", name) / ("path", p) / ("cp", ...) -> 过期时间
+        # negative_ttl 为 None 时永不过期
+        self.negative_ttl = negative_ttl
+        self.negative: dict[tuple, float] = {}
+
+    def memo_get(self, key: tuple, user_font: FontInfo | None):
+        entry = self.memo.get(key)
+        # 值里保存 user_font 本身，防止 id() 被回收后复用导致误命中
+        if entry is None or entry[0] is not user_font:
+            self.memo_misses += 1
+            return MISS
+        self.memo_hits += 1
+        try:
+            self.memo.move_to_end(key)
+        except KeyError:  # 并发模式下可能刚被其他线程淘汰，不影响结果
+            pass
+        return entry[1]
+
+    def memo_put(
+        self,
+        key: tuple,
+        user_font: FontInfo | None,
+        result: tuple[FontInfo, int] | None,
+    ):
+        if self.memo_size <= 0:
+            return
+        if self._lock is None:
+            self._memo_put(key, (user_font, result))
+        else:
+            with self._lock:
+                self._memo_put(key, (user_font, result))
+
+    def _memo_put(self, key: tuple, entry: tuple):
+        memo = self.memo
+        memo[key] = entry
+        memo.move_to_end(key)
+        if len(memo) > self.memo_size:
+            memo.popitem(last=False)
+
+    @property
+    def thread_safe(self) -> bool:
+        return self._lock is not None
+
+    def load_once(self, key: tuple, load: Callable[[], T]) -> T:
+        """
+        single-flight：同一个 key 的并发调用只有一个线程执行 `load`，其余线程等待并共享结果。
+        非线程安全模式下直接调用 `load`。
+        """
+        lock = self._lock
+        if lock is None:
+            return load()
+
+        with lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        assert flight is not None
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result  # type: ignore
+
+        try:
+            flight.result = load()
+            return flight.result  # type: ignore
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def current_dispatch(self) -> dict[int, tuple[FontInfo, ...]] | None:
+        """
+        返回按页分派表；缺失槽位的负缓存已过期时返回 None，由调用方重建并重试这些槽位。
+        """
+        dispatch = self.dispatch
+        expires = self.dispatch_expires
+        if dispatch is not None and expires != math.inf and expires < time.monotonic():
+            return None
+        return dispatch
+
+    def clear_memo(self):
+        self.memo = OrderedDict()
+
+    def invalidate(self, paths: Iterable[Path] | None = None):
+        """
+        系统字体变化后调用：丢弃来自 `paths` 的已加载字体 (None 表示全部)，
+        并清空负缓存、分派表和 memo，让新安装的字体有机会被找到。
+        新的结构全部建好后一次性替换，并发读者要么看到旧状态，要么看到新状态。
+        """
+        stale = None if paths is None else set(paths)
+
+        def keep(font: FontInfo | None) -> bool:
+            return font is not None and stale is not None and font.path not in stale
+
+        updates: dict[str, object] = {
+            "fallback": {s: f for s, f in self.fallback.items() if keep(f)},
+            "negative": {},
+            "dispatch": None,
+            "dispatch_expires": math.inf,
+            "memo": OrderedDict(),
+        }
+        for slot in SLOTS:
+            font = getattr(self, slot)
+            if font is not None and not keep(font):
+                # 直接写 _Slot 的存储属性，和其他结构在同一次 update 中发布
+                updates[_Slot.storage(slot)] = None
+        # 与 FontEnumerator._publish 相同：一次 __dict__.update 发布全部新结构，
+        # 无锁读者不会看到 fallback 已替换、memo 却还是旧的中间状态
+        self.__dict__.update(updates)
+
+    def is_negative(self, key: tuple) -> bool:
+        expiry = self.negative.get(key)
+        if expiry is None:
+            return False
+        if expiry < time.monotonic():
+            self.negative.pop(key, None)
+            return False
+        return True
+
+    def mark_negative(self, key: tuple):
+        ttl = self.negative_ttl
+        self.negative[key] = math.inf if ttl is None else time.monotonic() + ttl
+
+    def clear_negative(self):
+        self.negative.clear()
@@ -0,0 +1,157 @@
+from array import array
+from typing import Iterable, Iterator, NamedTuple
+from weakref import WeakKeyDictionary
+
+PAGE_SHIFT = 8
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+
+# 0/1 字节 -> ASCII '0'/'1'，用于把一页的覆盖标志整体转换成 int 位图
+_BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+class PageBitset(NamedTuple):
+    # 页号 -> 256 位的 int 位图，第 i 位对应码位 (页号 << 8) | i
+    bits: dict[int, int]
+    # 页号 -> 该页覆盖的码位数 (即 bits 的 popcount)
+    counts: dict[int, int]
+
+
+def page_bits(codepoints: Iterable[int]) -> dict[int, int]:
+    """
+    把码位集合按页打包成 int 位图，可与 Coverage.bitset() 按页求交。
+    """
+    pages: dict[int, int] = {}
+    for cp in codepoints:
+        key = cp >> PAGE_SHIFT
+        pages[key] = pages.get(key, 0) | 1 << (cp & PAGE_MASK)
+    return pages
+
+
+def _pack_page(page: array) -> int:
+    # 整页在 C 层完成：gid -> 0/1 字节 -> '0'/'1' 字符串 -> int，比逐位移位快一个数量级
+    return int(bytes(map(bool, page))[::-1].translate(_BIT_CHARS), 2)
+
+
+class Coverage:
+    """
+    紧凑的 unicode -> gid 映射。
+
+    两级页表：`cp >> 8` 作为页号，每页是 256 项的 array('H')，值为 gid，
+    0 表示未覆盖 (gid 0 是 .notdef，本来就不算覆盖)。
+    相比 dict[int, int] 每个码位只占 2 字节，查找仍然是一次 dict 访问加一次下标。
+    """
+
+    __slots__ = ("pages", "count", "__weakref__")
+
+    def __init__(self, pages: dict[int, array] | None = None, count: int | None = None):
+        self.pages: dict[int, array] = pages if pages is not None else {}
+        if count is None:
+            count = sum(PAGE_SIZE - page.count(0) for page in self.pages.values())
+        self.count = count
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[int, int]]) -> "Coverage":
+        pages: dict[int, array] = {}
+        count = 0
+        for cp, gid in items:
+            if gid <= 0 or gid > 0xFFFF:
+                continue
+            key = cp >> PAGE_SHIFT
+            page = pages.get(key)
+            if page is None:
+                page = pages[key] = array("H", bytes(2 * PAGE_SIZE))
+            if page[cp & PAGE_MASK] == 0:
+                count += 1
+            page[cp & PAGE_MASK] = gid
+        return cls(pages, count)
+
+    @classmethod
+    def from_runs(cls, runs: Iterable[tuple[int, array]]) -> "Coverage":
+        """
+        由 (起始码位, array('H') gid 序列) 批量构建，按页整段切片写入；gid 0 表示未覆盖。
+        """
+        pages: dict[int, array] = {}
+        for start, gids in runs:
+            pos, total = 0, len(gids)
+            while pos < total:
+                cp = start + pos
+                key = cp >> PAGE_SHIFT
+                page = pages.get(key)
+                if page is None:
+                    page = pages[key] = array("H", bytes(2 * PAGE_SIZE))
+                offset = cp & PAGE_MASK
+                step = min(PAGE_SIZE - offset, total - pos)
+                page[offset : offset + step] = gids[pos : pos + step]
+                pos += step
+        empty = [key for key, page in pages.items() if page.count(0) == PAGE_SIZE]
+        for key in empty:
+            del pages[key]
+        return cls(pages)
+
+    @classmethod
+    def from_dict(cls, unicode2gid: dict[int, int]) -> "Coverage":
+        return cls.from_items(unicode2gid.items())
+
+    def contains(self, cp: int) -> bool:
+        page = self.pages.get(cp >> PAGE_SHIFT)
+        return page is not None and page[cp & PAGE_MASK] != 0
+
+    def get_gid(self, cp: int) -> int | None:
+        page = self.pages.get(cp >> PAGE_SHIFT)
+        if page is None:
+            return None
+        return page[cp & PAGE_MASK] or None
+
+    def __contains__(self, cp: int) -> bool:
+        return self.contains(cp)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        for cp, _ in self.items():
+            yield cp
+
+    def items(self) -> Iterator[tuple[int, int]]:
+        for key in sorted(self.pages):
+            base = key << PAGE_SHIFT
+            for offset, gid in enumerate(self.pages[key]):
+                if gid:
+                    yield base + offset, gid
+
+    def ranges(self) -> Iterator[tuple[int, int]]:
+        """
+        按顺序返回连续覆盖的码位区间 [start, end)。
+        """
+        start = end = -1
+        for cp in self:
+            if cp != end:
+                if start >= 0:
+                    yield start, end
+                start = cp
+            end = cp + 1
+        if start >= 0:
+            yield start, end
+
+    @property
+    def nbytes(self) -> int:
+        return sum(page.itemsize * len(page) for page in self.pages.values())
+
+    def bitset(self) -> PageBitset:
+        """
+        按页的覆盖位图和计数，第一次调用时计算并缓存 (多个 face 共享的 Coverage 只算一次)。
+        """
+        bitset = _bitsets.get(self)
+        if bitset is None:
+            bits = {key: _pack_page(page) for key, page in self.pages.items()}
+            counts = {key: value.bit_count() for key, value in bits.items()}
+            bitset = _bitsets[self] = PageBitset(bits, counts)
+        return bitset
+
+    def __repr__(self) -> str:
+        return f"Coverage(count={self.count}, pages={len(self.pages)})"
+
+
+# Coverage 本身只读，位图随 Coverage 一起回收
+_bitsets: WeakKeyDictionary[Coverage, PageBitset] = WeakKeyDictionary()
@@ -1,9 +1,18 @@
+import heapq
 import logging
+import os
+import threading
+import time
+import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Iterable
 
-from fontmod.info import FontInfo
+from fontmod import stats
+from fontmod.cache import FontCache, default_cache_path
+from fontmod.coverage import PAGE_SIZE, Coverage, page_bits
+from fontmod.index import CoverageIndex, iter_bits
+from fontmod.info import FontInfo, clear_caches
 
 
 @dataclass(frozen=True)
@@ -12,31 +21,196 @@ class FontRecord:
     path: Path
 
     def __hash__(self):
-        return hash(self.path)
+        return hash((self.path, self.info.font_number))
+
+
+@dataclass(frozen=True)
+class FontChanges:
+    """
+    一次扫描带来的变化：修改过的文件表现为先删除旧记录、再添加新记录。
+    """
+
+    added: tuple[FontRecord, ...] = ()
+    removed: tuple[FontRecord, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+@dataclass(frozen=True)
+class _DirState:
+    mtime_ns: int
+    files: tuple[Path, ...]
+    subdirs: tuple[Path, ...]
+
+
+@dataclass
+class _RecordMaps:
+    """
+    FontEnumerator 对外可见的查询结构。更新时先在副本上修改，再整体替换。
+    """
+
+    font_records: set[FontRecord]
+    path_to_records: dict[Path, FontRecord]
+    name_to_records: dict[str, FontRecord]
+    name_to_paths: dict[str, list[Path]]
+    _index: CoverageIndex[FontRecord] | None
+
+    def add(self, records: list[FontRecord]):
+        self.font_records.update(records)
+        for record in records:
+            if self._index is not None:
+                self._index.add(record, record.info.coverage)
+            # 字体集合按路径只记录第一个 face，其余 face 通过名称查找
+            current = self.path_to_records.get(record.path)
+            if current is None or record.info.font_number < current.info.font_number:
+                self.path_to_records[record.path] = record
+            name = record.info.name
+            self.name_to_records[name] = record
+            # 列表与发布前的状态共享，只能整体替换，不能原地修改
+            paths = self.name_to_paths.get(name, [])
+            if record.path not in paths:
+                self.name_to_paths[name] = [*paths, record.path]
+
+    def remove(
+        self,
+        records: list[FontRecord],
+        path_records: dict[Path, tuple[FontRecord, ...]],
+    ):
+        for record in records:
+            self.font_records.discard(record)
+            if self._index is not None:
+                self._index.remove(record)
+            if self.path_to_records.get(record.path) is record:
+                del self.path_to_records[record.path]
+
+            name = record.info.name
+            paths = self.name_to_paths.get(name, [])
+            # 同一文件的其他 face 可能也叫这个名字 (少见)，都删掉后才移除路径
+            if record.path in paths and not any(
+                r.info.name == name for r in path_records.get(record.path, ())
+            ):
+                paths = [path for path in paths if path != record.path]
+                self.name_to_paths[name] = paths
+            if not paths:
+                self.name_to_paths.pop(name, None)
+            if self.name_to_records.get(name) is not record:
+                continue
+            # 退回到最近添加的同名字体
+            replacement = next(
+                (
+                    r
+                    for path in reversed(paths)
+                    for r in path_records.get(path, ())
+                    if r.info.name == name
+                ),
+                None,
+            )
+            if replacement is None:
+                del self.name_to_records[name]
+            else:
+                self.name_to_records[name] = replacement
 
 
 FONT_SUFFIXES = {".ttf", ".otf", ".ttc", ".otc"}
 
+DEFAULT_FONT_DIRS = (
+    Path("C:/Windows/Fonts"),
+    Path("/system/fonts"),
+    Path("/usr/share/fonts"),
+    Path("/Library/Fonts"),
+)
+
+
+def needed_codepoints(text: str) -> set[int]:
+    """
+    `text` 需要渲染的码位：先做 NFC 归一化，忽略空白和不可见的控制/格式字符。
+    """
+    return {
+        ord(ch)
+        for ch in unicodedata.normalize("NFC", text)
+        if not ch.isspace() and not unicodedata.category(ch).startswith("C")
+    }
+
+
+def _style_penalty(
+    info: FontInfo, serif: bool | None, bold: bool | None, italic: bool | None
+) -> int:
+    # 与要求不一致的样式数，None 表示不限
+    wanted = ((serif, info.is_serif), (bold, info.is_bold), (italic, info.is_italic))
+    return sum(want is not None and bool(have) != want for want, have in wanted)
+
+
+def _load_font(path: Path) -> tuple[tuple[FontInfo, ...], str | None, float]:
+    # 进程池的工作函数：异常在子进程内转成字符串，由父进程统一打日志；
+    # 解析耗时也带回父进程，供 stats 记录
+    start = time.perf_counter()
+    try:
+        faces, error = tuple(FontInfo.load_faces(path, lazy=True)), None
+    except Exception as e:
+        faces, error = (), str(e)
+    return faces, error, time.perf_counter() - start
+
+
+def _load_coverage(face: tuple[Path, int]) -> Coverage:
+    path, font_number = face
+    return FontInfo.load(path, lazy=True, font_number=font_number).coverage
+
 
 class FontEnumerator:
-    def __init__(self):
-        self.dirs: set[Path] = {
-            Path("C:/Windows/Fonts"),
-            Path("/system/fonts"),
-            Path("/usr/share/fonts"),
-            Path("/Library/Fonts"),
-        }
+    def __init__(
+        self,
+        dirs: Iterable[str | Path] | None = None,
+        cache_path: str | Path | None = None,
+        use_cache: bool = True,
+        workers: int | None = None,
+    ):
+        if dirs is None:
+            self.dirs: set[Path] = set(DEFAULT_FONT_DIRS)
+        else:
+            self.dirs = {Path(dir) for dir in dirs}
+        # workers > 1 时用进程池并行解析字体 (解析是 CPU 密集的，线程受 GIL 限制)
+        self.workers = workers
 
         self.font_records: set[FontRecord] = set()
         self.path_to_records: dict[Path, FontRecord] = {}
         self.name_to_records: dict[str, FontRecord] = {}
         self.name_to_paths: dict[str, list[Path]] = {}
+        # 路径 -> 该文件的全部 face，删除/修改文件时据此做增量更新
+        self._path_records: dict[Path, tuple[FontRecord, ...]] = {}
+        # 增量扫描状态：目录 mtime 没变就复用上次的列表，
+        # 文件按 (size, mtime) 判断是否修改
+        self._dir_states: dict[Path, _DirState] = {}
+        self._file_stats: dict[Path, tuple[int, int]] = {}
+        # 码位 -> 字体的倒排索引，第一次按码位查询时才构建
+        self._index: CoverageIndex[FontRecord] | None = None
+        # 串行化扫描和索引构建；查询不加锁，见 _publish
+        self._lock = threading.RLock()
+
+        self.cache: FontCache | None = None
+        if use_cache:
+            self.cache = FontCache(cache_path or default_cache_path())
+            self.cache.load()
+
+        self._update_fonts(self.dirs)
+
+    def register_font_dir(self, dir: str | Path) -> FontChanges:
+        """
+        注册并只扫描新目录，已注册目录不会被重新遍历。
+        """
+        dir = Path(dir).resolve()
+        self.dirs.add(dir)
+        return self._update_fonts([dir])
 
-        self._update_fonts()
+    def rescan(self, full: bool = False) -> FontChanges:
+        """
+        增量重新扫描所有已注册目录。
 
-    def register_font_dir(self, dir: str | Path):
-        self.dirs.add(Path(dir).resolve())
-        self._update_fonts()
+        mtime 没变的目录直接复用上次的文件列表 (只检查其子目录)，
+        只有 mtime 变化的目录才重新列出并 stat 其中的文件。
+        原地覆盖写入不会改变目录 mtime，需要时用 full=True 检查每个文件。
+        """
+        return self._update_fonts(self.dirs, full)
 
     def enumerate_fonts(self) -> Generator[Path, None, None]:
         for dir in self.dirs:
@@ -47,27 +221,274 @@ class FontEnumerator:
                     continue
                 yield path
 
-    def _update_fonts(self):
-        for path in self.enumerate_fonts():
-            if path in self.path_to_records:
-                continue
-            try:
-                info = FontInfo.load(path)
-                record = FontRecord(info, path)
-                self.font_records.add(record)
-            except Exception as e:
-                logging.warning(f"Failed to load font {path}: {e}")
+    @property
+    def scanned_dirs(self) -> list[Path]:
+        """
+        上次扫描到的全部目录 (包括子目录)。
+        """
+        return list(self._dir_states)
+
+    def _scan(
+        self, roots: Iterable[Path], full: bool
+    ) -> tuple[dict[Path, os.stat_result], set[Path]]:
+        """
+        遍历 `roots`，返回 (新增或修改的文件 -> stat, 已删除的文件)。
+        """
+        changed: dict[Path, os.stat_result] = {}
+        removed: set[Path] = set()
+        visited: set[Path] = set()
+        for root in roots:
+            stack = [root]
+            while stack:
+                dir = stack.pop()
+                if dir in visited:
+                    continue
+                try:
+                    mtime_ns = os.stat(dir).st_mtime_ns
+                except OSError:
+                    # 目录 (包括注册的根目录本身) 已被删除：不算访问过，下面会清理它的文件
+                    continue
+                visited.add(dir)
+                state = self._dir_states.get(dir)
+                if state is not None and state.mtime_ns == mtime_ns and not full:
+                    stack.extend(state.subdirs)
+                    continue
+
+                files, subdirs = self._list_dir(dir)
+                if state is not None:
+                    removed.update(set(state.files).difference(files))
+                self._dir_states[dir] = _DirState(mtime_ns, files, subdirs)
+                stack.extend(subdirs)
+                for path in files:
+                    try:
+                        st = os.stat(path)
+                    except OSError as e:
+                        logging.warning(f"Failed to stat font {path}: {e}")
+                        removed.add(path)
+                        continue
+                    if self._file_stats.get(path) != (st.st_size, st.st_mtime_ns):
+                        changed[path] = st
+
+            # 整个被删掉的子目录：其中的文件全部视为删除
+            for dir in [d for d in self._dir_states if d.is_relative_to(root)]:
+                if dir not in visited:
+                    removed.update(self._dir_states.pop(dir).files)
+
+        removed.difference_update(changed)
+        return changed, {path for path in removed if path in self._file_stats}
+
+    @staticmethod
+    def _list_dir(dir: Path) -> tuple[tuple[Path, ...], tuple[Path, ...]]:
+        files: list[Path] = []
+        subdirs: list[Path] = []
+        try:
+            with os.scandir(dir) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(Path(entry.path))
+                        elif (
+                            os.path.splitext(entry.name)[1].lower() in FONT_SUFFIXES
+                            and entry.is_file()
+                        ):
+                            files.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logging.warning(f"Failed to list font dir {dir}: {e}")
+        return tuple(files), tuple(subdirs)
+
+    def _update_fonts(self, roots: Iterable[Path], full: bool = False) -> FontChanges:
+        with self._lock:
+            return self._update_fonts_locked(list(roots), full)
+
+    def _update_fonts_locked(self, roots: list[Path], full: bool) -> FontChanges:
+        # 第一次扫描的目录需要清理缓存里已经不存在的文件
+        fresh = {root for root in roots if full or root not in self._dir_states}
+        with stats.timer("scan"):
+            changed, removed = self._scan(roots, full)
+
+        # 按路径缓存的解析结果已经过期
+        if removed or any(path in self._file_stats for path in changed):
+            clear_caches()
+
+        removed_records: list[FontRecord] = []
+        for path in [*removed, *changed]:
+            removed_records.extend(self._path_records.pop(path, ()))
+            if path in removed:
+                del self._file_stats[path]
+                if self.cache:
+                    self.cache.discard(path)
+
+        added: list[FontRecord] = []
+        pending: list[tuple[Path, os.stat_result]] = []
+        for path, st in changed.items():
+            self._file_stats[path] = (st.st_size, st.st_mtime_ns)
+            entry = self.cache.get(path, st) if self.cache else None
+            if entry is not None:
+                self._add_faces(path, entry.faces, added)
+            else:
+                pending.append((path, st))
+
+        paths = [path for path, _ in pending]
+        loads = self._load_fonts(paths)
+        for (path, st), (faces, error, seconds) in zip(pending, loads):
+            if stats.enabled:
+                stats.record_load(path, seconds, "enumerate", st.st_size)
+            if not faces:
+                logging.warning(f"Failed to load font {path}: {error}")
+            self._add_faces(path, faces, added)
+            if self.cache:
+                self.cache.put(path, st, faces)
+
+        if self._index is not None:
+            self._load_coverages(added)
+        self._publish(removed_records, added)
+        if self.cache:
+            if fresh:
+                self.cache.prune(fresh, set(self._file_stats))
+            self.cache.save()
+        return FontChanges(tuple(added), tuple(removed_records))
+
+    def _add_faces(self, path: Path, faces: Iterable[FontInfo], out: list[FontRecord]):
+        records = tuple(FontRecord(info, path) for info in faces)
+        self._path_records[path] = records
+        out.extend(records)
+
+    def _load_fonts(self, paths: list[Path]):
+        return self._map(_load_font, paths)
+
+    def _map(self, fn, items: list):
+        if not self.workers or self.workers <= 1 or len(items) <= 1:
+            return map(fn, items)
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = min(self.workers, len(items))
+        chunksize = max(1, len(items) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fn, items, chunksize=chunksize))
+
+    def _load_coverages(self, records: list[FontRecord]):
+        missing = [r for r in records if not r.info.coverage_loaded]
+        if not missing:
+            return
+        faces = [(r.path, r.info.font_number) for r in missing]
+        for record, coverage in zip(missing, self._map(_load_coverage, faces)):
+            object.__setattr__(record.info, "_coverage", coverage)
+        self.save_cache()
+
+    def _publish(self, removed: list[FontRecord], added: list[FontRecord]):
+        """
+        在副本上应用增删后整体替换，并发查询看到的要么是旧状态，要么是新状态。
+        """
+        if not removed and not added:
+            return
+        maps = _RecordMaps(
+            font_records=set(self.font_records),
+            path_to_records=dict(self.path_to_records),
+            name_to_records=dict(self.name_to_records),
+            # 各容器只做浅拷贝：name_to_paths 的列表由 add/remove 整体替换，
+            # 索引的增删只触及该字体覆盖的页
+            name_to_paths=dict(self.name_to_paths),
+            _index=self._index.copy() if self._index is not None else None,
+        )
+        maps.remove(removed, self._path_records)
+        maps.add(added)
+        # 实例 __dict__ 的 update 是一次持有 GIL 的 C 调用，不会只替换一半属性
+        self.__dict__.update(vars(maps))
+
+    @property
+    def index(self) -> CoverageIndex[FontRecord]:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    records = list(self.font_records)
+                    self._load_coverages(records)
+                    index: CoverageIndex[FontRecord] = CoverageIndex()
+                    for record in records:
+                        index.add(record, record.info.coverage)
+                    self._index = index
+        return self._index
+
+    def candidates_for_codepoint(self, cp: int) -> list[FontRecord]:
+        """
+        粗筛：返回在 `cp` 所在页内有覆盖的字体。
+        """
+        return self.index.candidates(cp)
+
+    def fonts_for_codepoint(self, cp: int) -> list[FontRecord]:
+        return [r for r in self.index.candidates(cp) if r.info.contains(cp)]
+
+    def pick_best_fonts(
+        self,
+        text: str,
+        top_k: int | None = 5,
+        require_full: bool = False,
+        serif: bool | None = None,
+        bold: bool | None = False,
+        italic: bool | None = False,
+    ) -> list[tuple[FontRecord, float]]:
+        """
+        按对 `text` 的覆盖率给字体排序，返回前 `top_k` 个 [(字体, 覆盖率)]，top_k=None 返回全部。
+
+        所需码位和每个字体的覆盖都按页打包成 int 位图，得分是逐页求交后 popcount 之和；
+        候选字体先由倒排索引按页筛出。覆盖率相同时与 serif/bold/italic 要求一致的字体优先
+        (None 表示不限)，再按名字排序。require_full=True 时只返回完全覆盖的字体。
+        """
+        need = page_bits(needed_codepoints(text))
+        if not need:
+            return []
+        need_counts = {key: bits.bit_count() for key, bits in need.items()}
+        total = sum(need_counts.values())
+
+        index = self.index
+        # 完全覆盖要求每个所需页都有覆盖，候选取各页的交集；否则取并集
+        candidates = -1 if require_full else 0
+        for key in need:
+            fonts = index.pages.get(key, 0)
+            candidates = candidates & fonts if require_full else candidates | fonts
+            if require_full and not candidates:
+                return []
+
+        scored = []
+        items = index.items
+        for font_id in iter_bits(candidates):
+            record = items[font_id]
+            assert record is not None
+            bits, counts = record.info.coverage.bitset()
+            hits = 0
+            for key, wanted in need.items():
+                count = counts.get(key, 0)
+                if count == PAGE_SIZE:  # 整页覆盖，不用求交
+                    hits += need_counts[key]
+                    continue
+                if require_full and count < need_counts[key]:
+                    break  # 该页覆盖的码位比需要的还少，不可能完全覆盖
+                if count:
+                    hits += (wanted & bits[key]).bit_count()
+            if hits == 0 or (require_full and hits < total):
                 continue
-        self._update_fonts_map()
-
-    def _update_fonts_map(self):
-        for record in self.font_records:
-            self.path_to_records[record.path] = record
-            self.name_to_records[record.info.name] = record
-            try:
-                self.name_to_paths[record.info.name].append(record.path)
-            except KeyError:
-                self.name_to_paths[record.info.name] = [record.path]
+            penalty = _style_penalty(record.info, serif, bold, italic)
+            # font_number 保证键唯一：集合中同名 face 不会退到比较 FontRecord 本身
+            scored.append(
+                (
+                    -hits,
+                    penalty,
+                    record.info.name.lower(),
+                    str(record.path),
+                    record.info.font_number,
+                    record,
+                )
+            )
+
+        best = sorted(scored) if top_k is None else heapq.nsmallest(top_k, scored)
+        return [(record, -hits / total) for hits, *_, record in best]
+
+    def save_cache(self):
+        # 扫描时只读了元数据，cmap 解码后再保存一次，下次启动就不必再解码
+        if self.cache:
+            self.cache.dirty = True
+            self.cache.save()
 
     def get_font(self, path: Path) -> FontRecord | None:
         return self.path_to_records.get(path)
@@ -0,0 +1,88 @@
+from itertools import compress
+from typing import Generic, Hashable, Iterator, TypeVar
+
+from fontmod.coverage import PAGE_SHIFT, Coverage
+
+T = TypeVar("T", bound=Hashable)
+
+# ASCII '0'/'1' -> 0/1 字节
+_DIGIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    # bin() 一次性转成 '0'/'1' 字节再用 compress 取出置位的下标，全部在 C 层完成；
+    # 逐位 bits & -bits 每一步都要复制整个大整数，在上千个字体的位图上是 O(置位数 × 位数)
+    flags = bin(bits)[:1:-1].encode().translate(_DIGIT_FLAGS)  # 去掉 '0b' 并反转
+    return compress(range(len(flags)), flags)
+
+
+class CoverageIndex(Generic[T]):
+    """
+    码位 -> 字体的倒排索引。
+
+    每个字体分配一个整数 id；每个页 (cp >> 8) 对应一个 int 位图，
+    第 i 位为 1 表示 id 为 i 的字体在该页内至少覆盖一个码位。
+    查询只需一次 dict 访问，再按位取出候选字体。
+    """
+
+    def __init__(self):
+        self.pages: dict[int, int] = {}
+        self.items: list[T | None] = []
+        self.ids: dict[T, int] = {}
+        # 每个字体覆盖的页，删除时只需清这些页上的位
+        self.item_pages: dict[T, tuple[int, ...]] = {}
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def copy(self) -> "CoverageIndex[T]":
+        index: CoverageIndex[T] = CoverageIndex()
+        index.pages = dict(self.pages)
+        index.items = list(self.items)
+        index.ids = dict(self.ids)
+        index.item_pages = dict(self.item_pages)
+        index._free = list(self._free)
+        return index
+
+    def add(self, item: T, coverage: Coverage) -> int:
+        font_id = self.ids.get(item)
+        if font_id is not None:
+            self.remove(item)
+        font_id = self._free.pop() if self._free else len(self.items)
+        if font_id == len(self.items):
+            self.items.append(item)
+        else:
+            self.items[font_id] = item
+        self.ids[item] = font_id
+
+        bit = 1 << font_id
+        pages = tuple(coverage.pages)
+        for page in pages:
+            self.pages[page] = self.pages.get(page, 0) | bit
+        self.item_pages[item] = pages
+        return font_id
+
+    def remove(self, item: T):
+        font_id = self.ids.pop(item, None)
+        if font_id is None:
+            return
+        mask = ~(1 << font_id)
+        for page in self.item_pages.pop(item):
+            bits = self.pages[page] & mask
+            if bits:
+                self.pages[page] = bits
+            else:
+                del self.pages[page]
+        self.items[font_id] = None
+        self._free.append(font_id)
+
+    def candidate_bits(self, cp: int) -> int:
+        return self.pages.get(cp >> PAGE_SHIFT, 0)
+
+    def candidates(self, cp: int) -> list[T]:
+        """
+        返回在 `cp` 所在页内有覆盖的字体 (可能包含并不覆盖 `cp` 本身的字体)。
+        """
+        items = self.items
+        return [items[i] for i in iter_bits(self.candidate_bits(cp))]  # type: ignore
@@ -1,34 +1,86 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
+from weakref import WeakValueDictionary
+
+from fontmod import stats
+from fontmod.coverage import PAGE_MASK, PAGE_SHIFT, Coverage
+from fontmod.sfnt import SfntReader, UnsupportedFont
 
-from fontTools.ttLib import TTFont, TTLibError
+# fontTools 导入耗时较长，只在快速路径不支持时才在函数内导入
+if TYPE_CHECKING:
+    from fontTools.ttLib import TTFont
 
 
 @dataclass(frozen=True)
 class FontInfo:
     name: str
     path: Path
-    unicode2gid: dict[int, int]
     is_bold: bool
     is_italic: bool
     is_serif: bool
+    # 字体集合 (.ttc/.otc) 中的 face 序号，gid 只在该 face 内有效
+    font_number: int = 0
+    # None 表示 cmap 尚未解码 (lazy 模式)，首次查询时再加载
+    _coverage: Coverage | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def coverage(self) -> Coverage:
+        coverage = self._coverage
+        if coverage is None:
+            with stats.timer("coverage"):
+                coverage = _load_coverage(self.path, self.font_number)
+            object.__setattr__(self, "_coverage", coverage)
+        return coverage
+
+    @property
+    def coverage_loaded(self) -> bool:
+        return self._coverage is not None
 
+    # 热路径：直接查页表，省掉一层方法调用
     def contains(self, cp: int) -> bool:
-        return cp in self.unicode2gid
+        coverage = self._coverage
+        if coverage is None:
+            coverage = self.coverage
+        page = coverage.pages.get(cp >> PAGE_SHIFT)
+        return page is not None and page[cp & PAGE_MASK] != 0
 
     def get_gid(self, cp: int) -> int | None:
-        try:
-            return self.unicode2gid[cp]
-        except KeyError:
+        coverage = self._coverage
+        if coverage is None:
+            coverage = self.coverage
+        page = coverage.pages.get(cp >> PAGE_SHIFT)
+        if page is None:
             return None
+        return page[cp & PAGE_MASK] or None
 
     @classmethod
-    def load(cls, path: str | Path) -> "FontInfo":
-        info = _load_font_info(path)
+    def load(
+        cls, path: str | Path, lazy: bool = False, font_number: int = 0
+    ) -> "FontInfo":
+        """
+        lazy=True 时只读取 name 和 OS/2 表，cmap 推迟到第一次 contains/get_gid。
+        """
+        info = _load_font_info(path, lazy, font_number)
         assert info is not None
         return info
 
+    @classmethod
+    def load_faces(cls, path: str | Path, lazy: bool = False) -> list["FontInfo"]:
+        """
+        加载文件中的所有 face：普通字体返回一项，字体集合每个 face 一项。
+        """
+        path = Path(path)
+        if _is_collection(path):
+            faces = _load_collection_infos(path, lazy)
+            assert faces is not None
+            return list(faces)
+        return [cls.load(path, lazy)]
+
 
 def _font_flags(font: TTFont) -> tuple[bool, bool, bool]:
     if "OS/2" not in font:
@@ -63,36 +115,150 @@ def _unicode2gid_map(tt: TTFont) -> dict[int, int]:
     return {unicode: gmap[glyph] for unicode, glyph in cmap.items() if glyph in gmap}
 
 
-@lru_cache(maxsize=1024)
-def _load_font_info(path: str | Path) -> FontInfo | None:
-    path = Path(path)
-    u2g: dict[int, int] = {}
+def _is_collection(path: Path) -> bool:
+    return path.suffix.lower() in {".ttc", ".otc"}
+
+
+# 同一文件中 cmap 表 (偏移, 长度) 相同的 face 共享同一个 Coverage
+_shared_coverages: WeakValueDictionary[tuple[Path, int, int], Coverage] = (
+    WeakValueDictionary()
+)
+
+
+def _shared_coverage(key: tuple[Path, int, int] | None, build) -> Coverage:
+    if key is not None:
+        coverage = _shared_coverages.get(key)
+        if coverage is not None:
+            return coverage
+    coverage = build()
+    if key is not None:
+        _shared_coverages[key] = coverage
+    return coverage
+
+
+def _face_coverage(tt: TTFont, path: Path) -> Coverage:
+    entry = tt.reader.tables.get("cmap") if tt.reader else None  # type: ignore
+    key = (path, entry.offset, entry.length) if entry else None
+    return _shared_coverage(key, lambda: Coverage.from_dict(_unicode2gid_map(tt)))
+
+
+def _fast_coverage(reader: SfntReader, path: Path, font_number: int) -> Coverage:
+    offset, length = reader.cmap_entry(font_number)
+    return _shared_coverage(
+        (path, offset, length), lambda: reader.coverage(font_number)
+    )
+
+
+def _load_coverage(path: Path, font_number: int = 0) -> Coverage:
     try:
-        if path.suffix.lower() in {".ttc", ".otc"}:
-            # 字体集合：遍历每个 face
-            with TTFont(path, fontNumber=0) as tt:  # 先打开以读取 numFonts
-                name = _font_name(tt)
-                assert name is not None
-                numFonts = tt.reader.numFonts  # type: ignore
-                serif, italic, bold = _font_flags(tt)
-            for idx in range(numFonts):
-                with TTFont(path, fontNumber=idx, lazy=True) as tt:
-                    u2g.update(_unicode2gid_map(tt))
-        else:
-            with TTFont(path, lazy=True) as tt:
-                name = _font_name(tt)
-                assert name is not None
-                serif, italic, bold = _font_flags(tt)
-                u2g = _unicode2gid_map(tt)
-    except TTLibError:
-        return None
-    except Exception:
-        return None
+        try:
+            with SfntReader(path) as reader:
+                return _fast_coverage(reader, path, font_number)
+        except UnsupportedFont:
+            pass
+        from fontTools.ttLib import TTFont
+
+        with TTFont(path, fontNumber=font_number, lazy=True) as tt:
+            return _face_coverage(tt, path)
+    except Exception as e:
+        logging.warning(f"Failed to load cmap of font {path}#{font_number}: {e}")
+        return Coverage()
+
+
+def _face_info(tt: TTFont, path: Path, lazy: bool, font_number: int) -> FontInfo:
+    # lazy=True 的 TTFont 只读表目录，这里只会解码 name 和 OS/2
+    name = _font_name(tt)
+    assert name is not None
+    serif, italic, bold = _font_flags(tt)
     return FontInfo(
         name=name,
         path=path,
-        unicode2gid=u2g,
         is_serif=serif,
         is_italic=italic,
         is_bold=bold,
+        font_number=font_number,
+        _coverage=None if lazy else _face_coverage(tt, path),
     )
+
+
+def _fast_face_infos(
+    path: Path, lazy: bool, font_numbers: range | None = None
+) -> tuple[FontInfo, ...]:
+    # 快速路径：直接从 mmap 读取 name/OS/2/cmap；任何一个 face 不支持就整体回退
+    with SfntReader(path) as reader:
+        infos = []
+        for idx in font_numbers if font_numbers is not None else range(len(reader)):
+            serif, italic, bold = reader.flags(idx)
+            infos.append(
+                FontInfo(
+                    name=reader.name(idx),
+                    path=path,
+                    is_serif=serif,
+                    is_italic=italic,
+                    is_bold=bold,
+                    font_number=idx,
+                    _coverage=None if lazy else _fast_coverage(reader, path, idx),
+                )
+            )
+        return tuple(infos)
+
+
+@lru_cache(maxsize=256)
+def _load_collection_infos(
+    path: Path, lazy: bool = False
+) -> tuple[FontInfo, ...] | None:
+    # 只打开一次文件；shareTables 让内容相同的表 (如共用的 cmap) 只解码一次
+    with stats.timer("parse"):
+        try:
+            try:
+                return _fast_face_infos(path, lazy)
+            except UnsupportedFont:
+                pass
+            from fontTools.ttLib import TTCollection
+
+            with open(path, "rb") as f:
+                collection = TTCollection(f, shareTables=True, lazy=True)
+                return tuple(
+                    _face_info(tt, path, lazy, idx)
+                    for idx, tt in enumerate(collection.fonts)
+                )
+        except Exception:  # 包括 fontTools.ttLib.TTLibError
+            return None
+
+
+@lru_cache(maxsize=1024)
+def _load_font_info(
+    path: str | Path, lazy: bool = False, font_number: int = 0
+) -> FontInfo | None:
+    path = Path(path)
+    if _is_collection(path):
+        faces = _load_collection_infos(path, lazy)
+        if faces is None or font_number >= len(faces):
+            return None
+        return faces[font_number]
+    # 集合在 _load_collection_infos 里计时，这里只计单个字体，避免重复计入
+    with stats.timer("parse"):
+        try:
+            try:
+                return _fast_face_infos(path, lazy, range(1))[0]
+            except UnsupportedFont:
+                pass
+            from fontTools.ttLib import TTFont
+
+            with TTFont(path, lazy=True) as tt:
+                return _face_info(tt, path, lazy, 0)
+        except Exception:  # 包括 fontTools.ttLib.TTLibError
+            return None
+
+
+stats.register_cache("info._load_font_info", _load_font_info)
+stats.register_cache("info._load_collection_infos", _load_collection_infos)
+
+
+def clear_caches():
+    """
+    丢弃按路径缓存的解析结果，字体文件被修改或删除后调用。
+    """
+    _load_font_info.cache_clear()
+    _load_collection_infos.cache_clear()
+    _shared_coverages.clear()
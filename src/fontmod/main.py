@@ -1,13 +1,11 @@
 from __future__ import annotations
 
+import json
 import logging
-# import unicodedata
-
-import fire
 
+from fontmod import stats as font_stats
 from fontmod.context import FontContext
-# from fontmod.enumerator import FontEnumerator, FontRecord
-from fontmod.picker import fz_encode_character_with_system_font
+from fontmod.picker import fz_encode_string_with_system_font
 
 WORDS = (
     ("拉丁文字 (Latin)", "AaBbCcÀáÂâÃãÄäÅåÆæÇçÈéÊêËëÌíÎîÏïÐðÑñÒóÔôÕõÖöØøÙúÛûÜüÝýÞþßÿ"),
@@ -99,120 +97,30 @@ WORDS = (
 )
 
 
-# def normalize_text(text: str) -> str:
-#     # 归一化，去掉不可见控制字符（保留换行/空格）
-#     t = unicodedata.normalize("NFC", text)
-#     return "".join(
-#         ch
-#         for ch in t
-#         if not unicodedata.category(ch).startswith("C") or ch in ("\n", "\t", "\r")
-#     )
-
-
-# def needed_codepoints(text: str) -> set[int]:
-#     t = normalize_text(text)
-#     # 忽略空白
-#     return {ord(ch) for ch in t if not ch.isspace()}
-
-
-# def coverage_for_font(fr: FontRecord, needed: set[int]) -> tuple[int, int, float]:
-#     """
-#     返回 (命中数, 需求总数, 覆盖率)
-#     """
-#     supported = fr.info.unicode2gid.keys()
-#     if not supported:
-#         return (0, len(needed), 0.0)
-#     hit = sum(1 for cp in needed if cp in supported)
-#     total = len(needed) if needed else 1
-#     return (hit, total, hit / total)
-
-
-# def pick_best_fonts(
-#     text: str, top_k: int = 5, require_full: bool = False
-# ) -> list[tuple[FontRecord, float]]:
-#     """
-#     从系统字体中挑选能渲染 `text` 的最佳字体。
-#     - require_full=True 时仅返回覆盖率==1 的字体
-#     - 否则返回覆盖率最高的 top_k
-#     """
-#     need = needed_codepoints(text)
-#     if not need:
-#         return []
-
-#     fe = FontEnumerator()
-
-#     candidates = fe.font_records
-#     scored: list[tuple[FontRecord, float]] = []
-#     for fr in candidates:
-#         hit, total, ratio = coverage_for_font(fr, need)
-#         if ratio == 1.0 and require_full:
-#             scored.append((fr, ratio))
-#         elif not require_full:
-#             # 提前剪枝：覆盖率过低的跳过（比如 0）
-#             if hit > 0:
-#                 scored.append((fr, ratio))
-
-#     scored.sort(key=lambda x: (x[1], x[0].info.name.lower()), reverse=True)
-
-#     if require_full:
-#         return scored[:top_k]
-#     return scored[:top_k]
-
-
-# def pick_font_fallback_chain(text: str, max_fonts: int = 3) -> list[FontRecord]:
-#     remaining = needed_codepoints(text)
-#     if not remaining:
-#         return []
-
-#     fe = FontEnumerator()
-#     chain: list[FontRecord] = []
-#     fonts = fe.font_records
-
-#     for _ in range(max_fonts):
-#         best: tuple[FontRecord, int] | None = None
-#         for fr in fonts:
-#             cps = fr.info.unicode2gid.keys()
-#             gain = len(remaining & set(cps))
-#             if gain == 0:
-#                 continue
-#             if best is None or gain > best[1]:
-#                 best = (fr, gain)
-#         if best is None:
-#             break
-#         fr, _ = best
-#         chain.append(fr)
-#         remaining = remaining - set(fr.info.unicode2gid.keys())
-#         if not remaining:
-#             break
-#     return chain
-
-
-# def main():
-#     for lang, word in WORDS:
-#         best = pick_best_fonts(word, top_k=5, require_full=False)
-#         for fr, ratio in best:
-#             print(f"    {word} -> {fr.info.name}  —  {ratio:.1%}  @ {fr.path}")
-
-#         chain = pick_font_fallback_chain(word, max_fonts=3)
-#         print("\nFallback chain:")
-#         for fr in chain:
-#             print(f"- {fr.info.name} @ {fr.path}")
-
-
-def main():
+def main(stats: bool = False):
+    """
+    --stats 打开埋点，结束后输出各阶段命中数、耗时、字体加载和缓存命中率 (JSON)。
+    """
+    if stats:
+        font_stats.enable()
     ctx = FontContext()
-    font = None
     for lang, word in WORDS:
         logging.info(f"{lang=}")
-        for c in word:
-            res = fz_encode_character_with_system_font(ctx, font, ord(c))
-            if res is not None:
-                font, gid = res
-                logging.info(f"    {c} -> {font.name=}  —  {gid=}")
+        for font, gids, start, end in fz_encode_string_with_system_font(
+            ctx, None, word
+        ):
+            text = word[start:end]
+            if font is not None:
+                logging.info(f"    {text} -> {font.name=}  —  {gids=}")
             else:
-                logging.info(f"    {c} -> ❌")
+                logging.info(f"    {text} -> ❌")
+    if stats:
+        print(json.dumps(font_stats.stats(ctx), indent=2, ensure_ascii=False))
 
 
 if __name__ == "__main__":
+    # fire 只在命令行入口使用，不拖慢作为库导入时的启动
+    import fire
+
     logging.basicConfig(level=logging.INFO)
     fire.Fire(main)
@@ -1,41 +1,112 @@
-import sys
+import math
+import time
+from typing import NamedTuple
 
-import fontTools
-import fontTools.unicodedata
-
-from fontmod.context import FontContext
+from fontmod import stats
+from fontmod.context import MISS, SLOTS, FontContext
+from fontmod.coverage import PAGE_SHIFT
 from fontmod.info import FontInfo
+from fontmod.platform import backend
+from fontmod.script import script_of
+
+
+# 平台后端延迟到第一次查找系统字体时才导入，只 import picker 的代价保持很小
+def load_system_text_font(
+    ctx: FontContext, script: str, serif: bool, bold: bool, italic: bool
+) -> FontInfo | None:
+    return backend().load_system_text_font(ctx, script, serif, bold, italic)
+
+
+def _slot_loader(slot: str):
+    name = f"load_system_{slot}_font"
+
+    def load(ctx: FontContext) -> FontInfo | None:
+        return getattr(backend(), name)(ctx)
+
+    load.__name__ = name
+    return load
+
+
+# 脚本字体之后的回退顺序
+SLOT_LOADERS = tuple(_slot_loader(slot) for slot in SLOTS)
+
+
+class _Dispatch(dict[int, tuple[FontInfo, ...]]):
+    """
+    按页分派表：页号 -> 在该页有覆盖的槽位字体 (保持回退顺序)。
+    只包含回退链前 `loaded` 个槽位，后面的槽位在前面的都无法渲染时才加载。
+    """
 
-if sys.platform == "win32":
-    from fontmod.platform.windows import (
-        load_system_boxes_font,
-        load_system_emoji_font,
-        load_system_math_font,
-        load_system_music_font,
-        load_system_symbol1_font,
-        load_system_symbol2_font,
-        load_system_text_font,
+    __slots__ = ("loaded",)
+
+    def __init__(self, pages: dict[int, tuple[FontInfo, ...]], loaded: int):
+        super().__init__(pages)
+        self.loaded = loaded
+
+
+def _dispatch_ready(dispatch: _Dispatch, unicode: int) -> bool:
+    # 已加载的槽位中有字体能渲染该码位 (后面的槽位不会更优先)，或者全部槽位都已加载
+    if dispatch.loaded == len(SLOTS):
+        return True
+    return any(
+        font.contains(unicode) for font in dispatch.get(unicode >> PAGE_SHIFT, ())
     )
-else:
-    from fontmod.platform.unix import (
-        load_system_boxes_font,
-        load_system_emoji_font,
-        load_system_math_font,
-        load_system_music_font,
-        load_system_symbol1_font,
-        load_system_symbol2_font,
-        load_system_text_font,
+
+
+def _dispatch_for(ctx: FontContext, unicode: int) -> _Dispatch:
+    """
+    返回足以解析 `unicode` 的分派表：按回退顺序逐个加载槽位字体，
+    直到某个槽位能渲染它或全部槽位都已加载。大多数码位只需探测一次。
+    """
+    dispatch = ctx.current_dispatch()
+    while dispatch is None or not _dispatch_ready(dispatch, unicode):  # type: ignore
+        dispatch = ctx.load_once(("dispatch",), lambda: _extend_dispatch(ctx))
+    return dispatch  # type: ignore
+
+
+def _extend_dispatch(ctx: FontContext) -> _Dispatch:
+    with stats.timer("dispatch"):
+        return _extend_dispatch_table(ctx)
+
+
+def _extend_dispatch_table(ctx: FontContext) -> _Dispatch:
+    # 槽位变化或负缓存过期时 FontContext 会丢弃分派表，从第一个槽位重新开始
+    current: _Dispatch | None = ctx.current_dispatch()  # type: ignore
+    loaded = current.loaded if current is not None else 0
+    if current is not None and loaded == len(SLOTS):
+        return current
+
+    font = SLOT_LOADERS[loaded](ctx)
+    pages = dict(current) if current is not None else {}
+    # 同一个字体可能占多个槽位 (如 boxes 与 symbol2)，后面的永远不会命中
+    if font is not None and all(getattr(ctx, s) is not font for s in SLOTS[:loaded]):
+        for page in font.coverage.pages:
+            pages[page] = (*pages.get(page, ()), font)
+    dispatch = _Dispatch(pages, loaded + 1)
+    # 缺失槽位的负缓存过期后分派表随之失效，新安装的槽位字体才有机会被找到
+    expires = min(
+        (ctx.negative.get(("slot", slot), math.inf) for slot in SLOTS[: loaded + 1]),
+        default=math.inf,
     )
+    # 加载槽位时 _Slot.__set__ 已清掉旧表，新表与过期时间一起发布
+    ctx.__dict__.update({"dispatch": dispatch, "dispatch_expires": expires})
+    return dispatch
 
 
-def fz_encode_character_with_system_font(
-    ctx: FontContext,
+class FontRun(NamedTuple):
+    # font 为 None 表示这一段字符没有任何字体能渲染，gids 全为 0 (.notdef)
+    font: FontInfo | None
+    gids: list[int]
+    start: int
+    end: int
+
+
+def _resolve_style(
     user_font: FontInfo | None,
-    unicode: int,
-    is_serif: bool | None = None,
-    is_italic: bool | None = None,
-    is_bold: bool | None = None,
-) -> tuple[FontInfo, int] | None:
+    is_serif: bool | None,
+    is_italic: bool | None,
+    is_bold: bool | None,
+) -> tuple[bool, bool, bool]:
     is_serif = (
         (user_font.is_serif if user_font else False) if is_serif is None else is_serif
     )
@@ -47,13 +118,97 @@ def fz_encode_character_with_system_font(
     is_bold = (
         (user_font.is_bold if user_font else False) if is_bold is None else is_bold
     )
+    return is_serif, is_italic, is_bold
+
+
+def fz_encode_character_with_system_font(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    unicode: int,
+    is_serif: bool | None = None,
+    is_italic: bool | None = None,
+    is_bold: bool | None = None,
+) -> tuple[FontInfo, int] | None:
+    is_serif, is_italic, is_bold = _resolve_style(
+        user_font, is_serif, is_italic, is_bold
+    )
+
+    key = (id(user_font), unicode, is_serif, is_bold, is_italic)
+    res = ctx.memo_get(key, user_font)
+    if res is MISS:
+        if stats.enabled:
+            res = _resolve_character_traced(
+                ctx, user_font, unicode, is_serif, is_italic, is_bold
+            )
+        else:
+            res = _resolve_character(
+                ctx, user_font, unicode, is_serif, is_italic, is_bold
+            )
+        # 设置了 negative_ttl 时不缓存找不到的结果，负缓存过期后才能重新查找
+        if res is not None or ctx.negative_ttl is None:
+            ctx.memo_put(key, user_font, res)
+    elif stats.enabled:
+        stats.hit("memo")
+    return res  # type: ignore
+
+
+def _resolve_character_traced(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    unicode: int,
+    is_serif: bool,
+    is_italic: bool,
+    is_bold: bool,
+) -> tuple[FontInfo, int] | None:
+    # 统计开启时使用：计时，并按结果反推命中的是回退链的哪一步，不改动解析逻辑本身
+    negative = ctx.is_negative(("cp", unicode, is_serif, is_bold, is_italic))
+    start = time.perf_counter()
+    res = _resolve_character(ctx, user_font, unicode, is_serif, is_italic, is_bold)
+    stats.add_time("resolve", time.perf_counter() - start)
+    stats.hit(_stage_of(ctx, user_font, unicode, res, negative))
+    return res
+
 
+def _stage_of(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    unicode: int,
+    res: tuple[FontInfo, int] | None,
+    negative: bool,
+) -> str:
+    if res is None:
+        return "negative" if negative else "miss"
+    font = res[0]
+    if font is user_font:
+        return "user"
+    if font is ctx.fallback.get(script_of(unicode)):
+        return "script"
+    # 同一字体占多个槽位时，分派表只保留第一个，这里也取第一个
+    for slot in SLOTS:
+        if getattr(ctx, slot) is font:
+            return slot
+    return "miss"
+
+
+def _resolve_character(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    unicode: int,
+    is_serif: bool,
+    is_italic: bool,
+    is_bold: bool,
+) -> tuple[FontInfo, int] | None:
     if user_font:
         gid = user_font.get_gid(unicode)
         if gid is not None:
             return user_font, gid
 
-    script = fontTools.unicodedata.script(unicode)
+    # 与 user_font 无关的负缓存：系统字体都无法渲染该码位
+    negative_key = ("cp", unicode, is_serif, is_bold, is_italic)
+    if ctx.is_negative(negative_key):
+        return None
+
+    script = script_of(unicode)
 
     font = load_system_text_font(ctx, script, is_serif, is_bold, is_italic)
     if font:
@@ -61,39 +216,65 @@ def fz_encode_character_with_system_font(
         if gid is not None:
             return font, gid
 
-    font = load_system_boxes_font(ctx)
-    if font:
-        gid = font.get_gid(unicode)
-        if gid is not None:
-            return font, gid
-    font = load_system_emoji_font(ctx)
-    if font:
+    dispatch = ctx.current_dispatch()
+    if dispatch is None or not _dispatch_ready(dispatch, unicode):  # type: ignore
+        dispatch = _dispatch_for(ctx, unicode)
+    for font in dispatch.get(unicode >> PAGE_SHIFT, ()):
         gid = font.get_gid(unicode)
         if gid is not None:
             return font, gid
 
-    font = load_system_math_font(ctx)
-    if font:
-        gid = font.get_gid(unicode)
-        if gid is not None:
-            return font, gid
+    ctx.mark_negative(negative_key)
+    return None
 
-    font = load_system_music_font(ctx)
-    if font:
-        gid = font.get_gid(unicode)
-        if gid is not None:
-            return font, gid
 
-    font = load_system_symbol1_font(ctx)
-    if font:
-        gid = font.get_gid(unicode)
-        if gid is not None:
-            return font, gid
+def fz_encode_string_with_system_font(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    text: str,
+    is_serif: bool | None = None,
+    is_italic: bool | None = None,
+    is_bold: bool | None = None,
+) -> list[FontRun]:
+    """
+    把 `text` 切分成使用同一字体的若干段。
+    用户字体优先；其次只要上一段的字体还覆盖下一个字符就继续沿用，
+    只有两者都不覆盖时才走完整的回退链。
+    """
+    is_serif, is_italic, is_bold = _resolve_style(
+        user_font, is_serif, is_italic, is_bold
+    )
 
-    font = load_system_symbol2_font(ctx)
-    if font:
-        gid = font.get_gid(unicode)
+    runs: list[FontRun] = []
+    font: FontInfo | None = None
+    gids: list[int] = []
+    start = 0
+    traced = stats.enabled
+    for i, ch in enumerate(text):
+        cp = ord(ch)
+        found = None
+        gid = user_font.get_gid(cp) if user_font else None
         if gid is not None:
-            return font, gid
+            found = user_font
+            if traced:
+                stats.hit("user")
+        elif font is not None and (gid := font.get_gid(cp)) is not None:
+            found = font
+            if traced:
+                stats.hit("run")
+        else:
+            res = fz_encode_character_with_system_font(
+                ctx, user_font, cp, is_serif, is_italic, is_bold
+            )
+            if res is not None:
+                found, gid = res
 
-    return None
+        if found is not font or not gids:
+            if gids:
+                runs.append(FontRun(font, gids, start, i))
+            font, gids, start = found, [], i
+        gids.append(gid or 0)
+
+    if gids:
+        runs.append(FontRun(font, gids, start, len(text)))
+    return runs
@@ -0,0 +1,15 @@
+import sys
+from functools import lru_cache
+from types import ModuleType
+
+
+@lru_cache(maxsize=1)
+def backend() -> ModuleType:
+    """
+    当前平台的字体查找后端，第一次真正需要查找系统字体时才导入。
+    """
+    if sys.platform == "win32":
+        from fontmod.platform import windows as module
+    else:
+        from fontmod.platform import unix as module
+    return module
@@ -0,0 +1,99 @@
+import logging
+import time
+from pathlib import Path
+from typing import Callable
+
+from fontmod import stats
+from fontmod.context import FontContext
+from fontmod.info import FontInfo
+
+# 各平台后端共用的加载流程：查缓存 -> 查负缓存 -> 找路径 -> 解析字体。
+# 找不到或解析失败都会记入 ctx 的负缓存，避免每次都重走查找链。
+
+
+def _load_font_file(ctx: FontContext, path: Path | None, purpose: str):
+    if path is None:
+        return None
+
+    key = ("path", path)
+    if ctx.is_negative(key):
+        return None
+    return ctx.load_once(key, lambda: _parse_font_file(ctx, key, path, purpose))
+
+
+def _parse_font_file(ctx: FontContext, key: tuple, path: Path, purpose: str):
+    try:
+        start = time.perf_counter()
+        font = FontInfo.load(path)
+        if stats.enabled:
+            stats.record_load(path, time.perf_counter() - start, purpose)
+        logging.info(f"🎉 Loaded path {path.name} for {purpose}")
+        return font
+    except Exception as e:
+        logging.warning(f"Failed to load font {path} for {purpose}: {e=}")
+        ctx.mark_negative(key)
+        return None
+
+
+def load_slot_font(
+    ctx: FontContext, slot: str, find_path: Callable[[], Path | None]
+) -> FontInfo | None:
+    font = getattr(ctx, slot)
+    if font is not None:
+        return font
+
+    key = ("slot", slot)
+    if ctx.is_negative(key):
+        return None
+    return ctx.load_once(key, lambda: _load_slot_font(ctx, slot, key, find_path))
+
+
+def _load_slot_font(
+    ctx: FontContext, slot: str, key: tuple, find_path: Callable[[], Path | None]
+) -> FontInfo | None:
+    # 等锁期间其他线程可能已经完成加载，领头线程需要再检查一次
+    font = getattr(ctx, slot)
+    if font is not None or ctx.is_negative(key):
+        return font
+
+    font = _load_font_file(ctx, find_path(), slot)
+    if font is None:
+        ctx.mark_negative(key)
+        return None
+    setattr(ctx, slot, font)
+    return font
+
+
+def load_script_font(
+    ctx: FontContext,
+    script: str,
+    serif: bool,
+    bold: bool,
+    italic: bool,
+    find_path: Callable[[], Path | None],
+) -> FontInfo | None:
+    try:
+        return ctx.fallback[script]
+    except KeyError:
+        pass
+
+    # find_path 的结果取决于样式：serif 找不到不代表 sans 也找不到
+    key = ("script", script, serif, bold, italic)
+    if ctx.is_negative(key):
+        return None
+    return ctx.load_once(key, lambda: _load_script_font(ctx, script, key, find_path))
+
+
+def _load_script_font(
+    ctx: FontContext, script: str, key: tuple, find_path: Callable[[], Path | None]
+) -> FontInfo | None:
+    font = ctx.fallback.get(script)
+    if font is not None or ctx.is_negative(key):
+        return font
+
+    font = _load_font_file(ctx, find_path(), f"script {script}")
+    if font is None:
+        ctx.mark_negative(key)
+        return None
+    ctx.fallback[script] = font
+    return font
@@ -1,10 +1,11 @@
 import itertools
-import logging
+from bisect import bisect_left
 from functools import lru_cache
 from pathlib import Path
 
+from fontmod import stats
 from fontmod.context import FontContext
-from fontmod.info import FontInfo
+from fontmod.platform.common import load_script_font, load_slot_font
 
 _font_dirs = [
     Path("/system/fonts"),
@@ -17,16 +18,35 @@ def _font_files(paths: list[Path]):
     return itertools.chain.from_iterable(path.rglob("*") for path in paths)
 
 
+@lru_cache(maxsize=1)
+def _font_index() -> tuple[list[str], list[Path]]:
+    # 每个进程只遍历一次字体目录，按文件名排序后用二分查找前缀
+    with stats.timer("scan"):
+        entries = sorted(
+            (path.name, path) for path in _font_files(_font_dirs) if path.is_file()
+        )
+    return [name for name, _ in entries], [path for _, path in entries]
+
+
+def _reset_font_index():
+    _font_index.cache_clear()
+    _load_noto.cache_clear()
+
+
 @lru_cache(maxsize=1024)
 def _load_noto(a: str, b: str, c: str):
     stem = f"{a}{b}{c}"
-    for path in _font_files(_font_dirs):
-        if path.name.startswith(stem):
-            return path
+    names, paths = _font_index()
+    i = bisect_left(names, stem)
+    if i < len(names) and names[i].startswith(stem):
+        return paths[i]
 
     return None
 
 
+stats.register_cache("unix._load_noto", _load_noto)
+
+
 def _load_noto_cjk(script: str, serif: bool = False):
     match script:
         case "Hani":
@@ -78,119 +98,56 @@ def _load_noto_try(stem: str, serif: bool = False):
 
 
 def load_system_boxes_font(ctx: FontContext):
-    if ctx.boxes is not None:
-        return ctx.boxes
-
-    path = _load_noto("NotoSans", "Symbols2", "-Regular")
-    if path is None:
-        return None
-
-    try:
-        ctx.boxes = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for boxes")
-        return ctx.boxes
-    except Exception:
-        logging.warning(f"Failed to load font {path} for boxes")
-        return None
+    return load_slot_font(
+        ctx, "boxes", lambda: _load_noto("NotoSans", "Symbols2", "-Regular")
+    )
 
 
 def load_system_emoji_font(ctx: FontContext):
-    if ctx.emoji is not None:
-        return ctx.emoji
-
-    path = _load_noto("NotoColorEmoji", "", "")
-    if path is None:
-        return None
-
-    try:
-        ctx.emoji = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for emoji")
-        return ctx.emoji
-    except Exception:
-        logging.warning(f"Failed to load font {path} for emoji")
-        return None
+    return load_slot_font(ctx, "emoji", lambda: _load_noto("NotoColorEmoji", "", ""))
 
 
 def load_system_math_font(ctx: FontContext):
-    if ctx.math is not None:
-        return ctx.math
-
-    path = _load_noto("NotoSans", "Math", "-Regular") or _load_noto(
-        "Noto", "SansMath", "-Regular"
+    return load_slot_font(
+        ctx,
+        "math",
+        lambda: (
+            _load_noto("NotoSans", "Math", "-Regular")
+            or _load_noto("Noto", "SansMath", "-Regular")
+        ),
     )
-    if path is None:
-        return None
-
-    try:
-        ctx.math = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for math")
-        return ctx.math
-    except Exception:
-        logging.warning(f"Failed to load font {path} for math")
-        return None
-
-    return ctx.math
 
 
 def load_system_music_font(ctx: FontContext):
-    if ctx.music is not None:
-        return ctx.music
-
-    path = _load_noto("Noto", "Music", "-Regular")
-    if path is None:
-        return None
-
-    try:
-        ctx.music = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for music")
-        return ctx.music
-    except Exception:
-        logging.warning(f"Failed to load font {path} for music")
-        return None
+    return load_slot_font(ctx, "music", lambda: _load_noto("Noto", "Music", "-Regular"))
 
 
 def load_system_symbol1_font(ctx: FontContext):
-    if ctx.symbol1 is not None:
-        return ctx.symbol1
-
-    path = _load_noto("NotoSans", "Symbols", "-Regular")
-    if path is None:
-        return None
-
-    try:
-        ctx.symbol1 = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for symbol1")
-        return ctx.symbol1
-    except Exception:
-        logging.warning(f"Failed to load font {path} for symbol1")
-        return None
+    return load_slot_font(
+        ctx, "symbol1", lambda: _load_noto("NotoSans", "Symbols", "-Regular")
+    )
 
 
 def load_system_symbol2_font(ctx: FontContext):
-    if ctx.symbol2 is not None:
-        return ctx.symbol2
-
-    path = _load_noto("NotoSans", "Symbols2", "-Regular")
-    if path is None:
-        return None
-
-    try:
-        ctx.symbol2 = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for symbol2")
-        return ctx.symbol2
-    except Exception:
-        logging.warning(f"Failed to load font {path} for symbol2")
-        return None
+    return load_slot_font(
+        ctx, "symbol2", lambda: _load_noto("NotoSans", "Symbols2", "-Regular")
+    )
 
 
 def load_system_text_font(
     ctx: FontContext, script: str, serif: bool, bold: bool, italic: bool
 ):
-    try:
-        return ctx.fallback[script]
-    except KeyError:
-        pass
+    return load_script_font(
+        ctx,
+        script,
+        serif,
+        bold,
+        italic,
+        lambda: _text_font_path(script, serif, bold, italic),
+    )
+
 
+def _text_font_path(script: str, serif: bool, bold: bool, italic: bool):
     match script:
         case "Zyyy" | "Zinh" | "Zzzz":
             path = None
@@ -501,16 +458,4 @@ def load_system_text_font(
         case _:
             return None
 
-    if path is None:
-        return None
-
-    try:
-        font_info = FontInfo.load(path)
-        ctx.fallback[script] = font_info
-        logging.info(f"🎉 Loaded path {path.name} for script {script}")
-        return font_info
-    except Exception:
-        logging.warning(f"Failed to load font {path} for script {script}")
-        return None
-
-    return None
+    return path
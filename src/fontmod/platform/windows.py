@@ -1,11 +1,11 @@
 from functools import lru_cache
 import itertools
-import logging
 from dataclasses import dataclass
 from pathlib import Path
 
+from fontmod import stats
 from fontmod.context import FontContext
-from fontmod.info import FontInfo
+from fontmod.platform.common import load_script_font, load_slot_font
 
 
 @dataclass(frozen=True)
@@ -88,6 +88,22 @@ def _font_files(paths: list[Path]):
     return itertools.chain.from_iterable(path.rglob("*") for path in paths)
 
 
+@lru_cache(maxsize=1)
+def _font_file_map() -> dict[str, Path]:
+    # 小写文件名 -> 路径，整个进程只扫描一次字体目录 (Windows 文件名不区分大小写)
+    files: dict[str, Path] = {}
+    with stats.timer("scan"):
+        for path in _font_files(_font_dirs):
+            if path.is_file():
+                files.setdefault(path.name.lower(), path)
+    return files
+
+
+def _reset_font_index():
+    _font_file_map.cache_clear()
+    _load_font.cache_clear()
+
+
 @lru_cache(maxsize=1024)
 def _load_font(fontname: str):
     if not fontname:
@@ -98,8 +114,11 @@ def _load_font(fontname: str):
     except KeyError:
         return None
 
-    paths = (path for path in _font_files(_font_dirs) if filename == path.name)
-    return next(paths, None)
+    return _font_file_map().get(filename.lower())
+
+
+stats.register_cache("windows._load_font", _load_font)
+
 
 def _load_family(base: str, bold: bool = False, italic: bool = False):
     if not base:
@@ -132,115 +151,59 @@ def _load_families(names: list[str], bold: bool = False, italic: bool = False):
 
 
 def load_system_boxes_font(ctx: FontContext):
-    if ctx.boxes is not None:
-        return ctx.boxes
-
-    path = _load_families(["Segoe UI Symbol"], False, False)
-    if path is None:
-        return None
-
-    try:
-        ctx.boxes = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for boxes")
-        return ctx.boxes
-    except Exception:
-        logging.warning(f"Failed to load font {path} for boxes")
-        return None
+    return load_slot_font(
+        ctx, "boxes", lambda: _load_families(["Segoe UI Symbol"], False, False)
+    )
 
 
 def load_system_emoji_font(ctx: FontContext):
-    if ctx.emoji is not None:
-        return ctx.emoji
-
-    path = _load_families(["Segoe UI Emoji"], False, False)
-    if path is None:
-        return None
-
-    try:
-        ctx.emoji = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for emoji")
-        return ctx.emoji
-    except Exception:
-        logging.warning(f"Failed to load font {path} for emoji")
-        return None
+    return load_slot_font(
+        ctx, "emoji", lambda: _load_families(["Segoe UI Emoji"], False, False)
+    )
 
 
 def load_system_math_font(ctx: FontContext):
-    if ctx.math is not None:
-        return ctx.math
-
-    path = _load_families(["Cambria Math", "Cambria"], False, False)
-    if path is None:
-        return None
-
-    try:
-        ctx.math = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for math")
-        return ctx.math
-    except Exception:
-        logging.warning(f"Failed to load font {path} for math")
-        return None
+    return load_slot_font(
+        ctx, "math", lambda: _load_families(["Cambria Math", "Cambria"], False, False)
+    )
 
 
 def load_system_music_font(ctx: FontContext):
-    if ctx.music is not None:
-        return ctx.music
-
-    path = _load_families(["Segoe UI Symbol"], False, False)
-    if path is None:
-        return None
-
-    try:
-        ctx.music = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for music")
-        return ctx.music
-    except Exception:
-        logging.warning(f"Failed to load font {path} for music")
-        return None
+    return load_slot_font(
+        ctx, "music", lambda: _load_families(["Segoe UI Symbol"], False, False)
+    )
 
 
 def load_system_symbol1_font(ctx: FontContext):
-    if ctx.symbol1 is not None:
-        return ctx.symbol1
-
-    path = _load_families(["Segoe UI Symbol", "Symbol"], False, False)
-    if path is None:
-        return None
-
-    try:
-        ctx.symbol1 = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for symbol1")
-        return ctx.symbol1
-    except Exception:
-        logging.warning(f"Failed to load font {path} for symbol1")
-        return None
+    return load_slot_font(
+        ctx,
+        "symbol1",
+        lambda: _load_families(["Segoe UI Symbol", "Symbol"], False, False),
+    )
 
 
 def load_system_symbol2_font(ctx: FontContext):
-    if ctx.symbol2 is not None:
-        return ctx.symbol2
-
-    path = _load_families(["Segoe UI Historic", "Segoe UI Symbol"], False, False)
-    if path is None:
-        return None
-
-    try:
-        ctx.symbol2 = FontInfo.load(path)
-        logging.info(f"🎉 Loaded path {path.name} for symbol2")
-        return ctx.symbol2
-    except Exception:
-        logging.warning(f"Failed to load font {path} for symbol2")
-        return None
+    return load_slot_font(
+        ctx,
+        "symbol2",
+        lambda: _load_families(["Segoe UI Historic", "Segoe UI Symbol"], False, False),
+    )
 
 
 def load_system_text_font(
     ctx: FontContext, script: str, serif: bool, bold: bool, italic: bool
 ):
-    try:
-        return ctx.fallback[script]
-    except KeyError:
-        pass
+    return load_script_font(
+        ctx,
+        script,
+        serif,
+        bold,
+        italic,
+        lambda: _text_font_path(script, serif, bold, italic),
+    )
 
+
+def _text_font_path(script: str, serif: bool, bold: bool, italic: bool):
     match script:
         case "Zyyy" | "Zinh" | "Zzzz":
             return None
@@ -334,14 +297,4 @@ def load_system_text_font(
         case _:
             return None
 
-    if path is None:
-        return None
-
-    try:
-        font_info = FontInfo.load(path)
-        ctx.fallback[script] = font_info
-        logging.info(f"🎉 Loaded path {path.name} for script {script}")
-        return font_info
-    except Exception as e:
-        logging.warning(f"Failed to load font {path} for script {script}: {e=}")
-        return None
+    return path
@@ -0,0 +1,201 @@
+import cProfile
+import io
+import pstats
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable
+
+from fontmod.context import SLOTS, FontContext
+from fontmod.info import FontInfo, clear_caches
+
+# `python -m fontmod profile <workload>`：在 cProfile / tracemalloc 下跑一个工作负载，
+# 输出耗时最多的函数、按模块汇总的内存分配和每个 FontInfo 的内存占用。
+# 每种分析都从冷缓存开始单独跑一遍，两个工具不会互相干扰计时和分配统计。
+
+WORKLOADS = ("enumerate", "load", "resolve", "words")
+
+
+def _reset():
+    clear_caches()
+    for name in ("fontmod.platform.unix", "fontmod.platform.windows"):
+        module = sys.modules.get(name)
+        if module is not None:
+            module._reset_font_index()
+
+
+def _context_fonts(ctx: FontContext) -> list[FontInfo]:
+    fonts = [*ctx.fallback.values(), *(getattr(ctx, slot) for slot in SLOTS)]
+    return list({id(font): font for font in fonts if font is not None}.values())
+
+
+def _resolve_texts(texts: Iterable[str]) -> list[FontInfo]:
+    from fontmod.picker import fz_encode_string_with_system_font
+
+    ctx = FontContext()
+    for text in texts:
+        fz_encode_string_with_system_font(ctx, None, text)
+    return _context_fonts(ctx)
+
+
+def _workload(
+    name: str, target: str | None, dirs: list[str] | None
+) -> Callable[[], list[FontInfo]]:
+    """
+    返回执行工作负载的函数，它返回负载中加载的 FontInfo，用于统计内存占用。
+    """
+    if name == "enumerate":
+        from fontmod.enumerator import FontEnumerator
+
+        def run():
+            fe = FontEnumerator(dirs=dirs, use_cache=False)
+            fe.index  # 连同倒排索引一起构建
+            return [record.info for record in fe.font_records]
+
+        return run
+    if name in ("load", "resolve") and target is None:
+        raise ValueError(f"workload {name!r} needs a target file")
+    if name == "load":
+        return lambda: FontInfo.load_faces(target)  # type: ignore
+    if name == "resolve":
+        return lambda: _resolve_texts(Path(target).read_text().splitlines())  # type: ignore
+    if name == "words":
+        from fontmod.main import WORDS
+
+        return lambda: _resolve_texts(word for _, word in WORDS)
+    raise ValueError(f"unknown workload {name!r}, expected one of {WORKLOADS}")
+
+
+def font_info_footprint(info: FontInfo) -> dict:
+    """
+    估算一个 FontInfo 的内存占用 (字节)：对象本身、名字和路径，以及 cmap 页表。
+    """
+    size = sys.getsizeof
+    object_bytes = (
+        size(info) + size(vars(info)) + size(info.name) + size(str(info.path))
+    )
+    coverage = info._coverage
+    coverage_bytes = 0
+    pages = 0
+    if coverage is not None:
+        pages = len(coverage.pages)
+        coverage_bytes = (
+            size(coverage)
+            + size(coverage.pages)
+            + sum(size(page) for page in coverage.pages.values())
+        )
+    return {
+        "name": info.name,
+        "font_number": info.font_number,
+        "object_bytes": object_bytes,
+        "coverage_bytes": coverage_bytes,
+        "pages": pages,
+        "codepoints": len(coverage) if coverage is not None else 0,
+    }
+
+
+def _module_files() -> dict[str, str]:
+    files = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path:
+            files[path] = name
+    return files
+
+
+def allocations_by_module(
+    snapshot: tracemalloc.Snapshot, top: int = 20
+) -> list[tuple[str, int, int]]:
+    """
+    把仍然存活的分配按分配处所在模块汇总，返回 [(模块, 字节数, 块数)]，按字节数降序。
+    """
+    files = _module_files()
+    totals: dict[str, list[int]] = {}
+    for stat in snapshot.statistics("filename"):
+        filename = stat.traceback[0].filename
+        module = files.get(filename, filename)
+        entry = totals.setdefault(module, [0, 0])
+        entry[0] += stat.size
+        entry[1] += stat.count
+    rows = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+    return [(module, size, count) for module, (size, count) in rows[:top]]
+
+
+def _profile_cpu(run: Callable, top: int, sort: str, output: str | None) -> str:
+    _reset()
+    profiler = cProfile.Profile()
+    profiler.runcall(run)
+    if output is not None:
+        profiler.dump_stats(output)
+    buf = io.StringIO()
+    pstats.Stats(profiler, stream=buf).sort_stats(sort).print_stats(top)
+    return buf.getvalue()
+
+
+def _profile_memory(run: Callable, top: int, frames: int) -> str:
+    _reset()
+    tracemalloc.start(frames)
+    try:
+        fonts = run()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+
+    lines = [
+        f"traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB"
+    ]
+    lines.append(f"\n{'bytes':>12} {'blocks':>8}  module")
+    for module, size, count in allocations_by_module(snapshot, top):
+        lines.append(f"{size:>12} {count:>8}  {module}")
+
+    lines.append(f"\n{'object':>8} {'cmap':>10} {'pages':>6} {'cps':>7}  font")
+    # 同一文件中 cmap 相同的 face 共享页表，只在第一次出现时计入
+    seen: set[int] = set()
+    rows = []
+    for font in fonts:
+        row = font_info_footprint(font)
+        if id(font._coverage) in seen:
+            row["coverage_bytes"] = 0
+        seen.add(id(font._coverage))
+        rows.append(row)
+    rows.sort(key=lambda row: row["object_bytes"] + row["coverage_bytes"], reverse=True)
+    for row in rows[:top]:
+        name = f"{row['name']}#{row['font_number']}"
+        lines.append(
+            f"{row['object_bytes']:>8} {row['coverage_bytes']:>10} "
+            f"{row['pages']:>6} {row['codepoints']:>7}  {name}"
+        )
+    total = sum(row["object_bytes"] + row["coverage_bytes"] for row in rows)
+    lines.append(f"{len(rows)} fonts, {total / 1024:.1f} KiB in FontInfo")
+    return "\n".join(lines)
+
+
+def profile(
+    workload: str = "words",
+    target: str | None = None,
+    dirs: list[str] | None = None,
+    cpu: bool = True,
+    memory: bool = True,
+    top: int = 20,
+    sort: str = "cumulative",
+    output: str | None = None,
+    frames: int = 1,
+):
+    """
+    在 cProfile 和/或 tracemalloc 下运行工作负载并打印报告。
+
+    workload: enumerate (扫描 `dirs` 并建索引)、load (加载字体文件 `target`)、
+    resolve (逐行解析文本文件 `target`)、words (解析内置的 WORDS 语料)。
+    output: 保存 cProfile 结果的 .pstats 路径，可用 `python -m pstats` 或 snakeviz 查看。
+    """
+    run = _workload(workload, target, dirs)
+    if cpu:
+        print(f"== cProfile: {workload} (top {top} by {sort}) ==")
+        print(_profile_cpu(run, top, sort, output))
+    if memory:
+        print(f"== tracemalloc: {workload} ==")
+        print(_profile_memory(run, top, frames))
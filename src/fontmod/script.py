@@ -0,0 +1,107 @@
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+BLOCK_SHIFT = 7
+BLOCK_SIZE = 1 << BLOCK_SHIFT
+BLOCK_MASK = BLOCK_SIZE - 1
+MAX_UNICODE = 0x10FFFF
+
+# 块内码位属于不同 script 时的标记，具体值到 mixed 表里查
+_MIXED = 0xFF
+
+
+# 预先生成的 script 区间表所在模块，由 fontTools 的 Scripts 数据生成，
+# 运行时不需要导入 fontTools。升级 fontTools 后用 `python -m fontmod.script` 重新生成。
+DATA_PATH = Path(__file__).with_name("_script_data.py")
+
+
+def render_script_data() -> str:
+    """
+    由 fontTools.unicodedata.Scripts 生成 _script_data.py 的内容：
+    NAMES 是排序后的 script 代码，RANGES 是各区间起点，IDS 是各区间的 script id。
+    """
+    import fontTools
+    from fontTools.unicodedata import Scripts
+
+    names = sorted(set(Scripts.VALUES))
+    assert len(names) < _MIXED
+    ids = {name: i for i, name in enumerate(names)}
+    starts = [f"0x{start:04X}," for start in Scripts.RANGES]
+    values = bytes(ids[value] for value in Scripts.VALUES).hex()
+
+    lines = [
+        f"# 由 fontmod.script.render_script_data 从 fontTools {fontTools.version} 生成，不要手工修改",
+        "",
+        "# fmt: off",
+        "NAMES = [",
+        *(f'    "{name}",' for name in names),
+        "]",
+        "",
+        "RANGES = (",
+        *("    " + " ".join(starts[i : i + 8]) for i in range(0, len(starts), 8)),
+        ")",
+        "",
+        "IDS = bytes.fromhex(",
+        *(f'    "{values[i : i + 64]}"' for i in range(0, len(values), 64)),
+        ")",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=1)
+def _script_table() -> tuple[array, dict[int, bytes], list[str]]:
+    """
+    由预生成的区间表构建一次的查找表：
+    每 128 个码位一个块，整块同一 script 时直接存 script id，
+    否则记为 _MIXED 并在 mixed 中保存该块逐码位的 id。
+    """
+    from fontmod._script_data import IDS, NAMES, RANGES
+
+    blocks = array("B", bytes((MAX_UNICODE >> BLOCK_SHIFT) + 1))
+    mixed: dict[int, bytes] = {}
+    n = len(RANGES)
+    i = 0
+    for block in range(len(blocks)):
+        start = block << BLOCK_SHIFT
+        end = start + BLOCK_SIZE
+        while i + 1 < n and RANGES[i + 1] <= start:
+            i += 1
+        if i + 1 == n or RANGES[i + 1] >= end:
+            blocks[block] = IDS[i]
+            continue
+        chunk = bytearray(BLOCK_SIZE)
+        j = i
+        while j < n and RANGES[j] < end:
+            lo = max(RANGES[j], start) - start
+            hi = (min(RANGES[j + 1], end) if j + 1 < n else end) - start
+            chunk[lo:hi] = bytes([IDS[j]]) * (hi - lo)
+            j += 1
+        blocks[block] = _MIXED
+        mixed[block] = bytes(chunk)
+    return blocks, mixed, NAMES
+
+
+_blocks: array | None = None
+_mixed: dict[int, bytes] = {}
+_names: list[str] = []
+
+
+def script_of(cp: int) -> str:
+    """
+    返回码位的 ISO 15924 script 代码，结果与 fontTools.unicodedata.script 一致。
+    """
+    global _blocks, _mixed, _names
+    if _blocks is None:
+        _blocks, _mixed, _names = _script_table()
+    if cp > MAX_UNICODE or cp < 0:
+        return "Zzzz"
+    sid = _blocks[cp >> BLOCK_SHIFT]
+    if sid == _MIXED:
+        sid = _mixed[cp >> BLOCK_SHIFT][cp & BLOCK_MASK]
+    return _names[sid]
+
+
+if __name__ == "__main__":
+    DATA_PATH.write_text(render_script_data())
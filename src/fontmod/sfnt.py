@@ -0,0 +1,239 @@
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from fontmod.coverage import Coverage
+
+# 直接读取 sfnt 二进制的快速路径：mmap 文件，只解析表目录、name、OS/2、maxp 和 cmap，
+# cmap 子表中的 gid 直接写入 Coverage 页表，不构造 TTFont，也不需要 glyph order。
+# 遇到不认识的情况抛 UnsupportedFont，由调用方回退到 fontTools。
+
+MAX_UNICODE = 0x10FFFF
+
+# 与 fontTools TTFont.getBestCmap 相同的子表优先级
+CMAP_PREFERENCES = ((3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0))
+
+# 与 info._font_name 相同的 name 记录优先级 (nameID=4, platformID, platEncID)
+NAME_PREFERENCES = ((3, 1), (0, 3), (0, 4))
+
+_SFNT_VERSIONS = {b"\x00\x01\x00\x00", b"OTTO", b"true"}
+_SWAP = sys.byteorder == "little"
+
+
+class UnsupportedFont(Exception):
+    pass
+
+
+def _be_array(typecode: str, data: bytes) -> array:
+    arr = array(typecode, data)
+    if _SWAP:
+        arr.byteswap()
+    return arr
+
+
+class SfntReader:
+    """
+    只读 mmap 的 sfnt 读取器，支持单个字体和 TTC/OTC 集合。
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # 空文件
+                raise UnsupportedFont(str(e)) from e
+        try:
+            self.faces = self._read_directories()
+        except struct.error as e:
+            self.close()
+            raise UnsupportedFont(f"truncated table directory: {e}") from e
+        except UnsupportedFont:
+            self.close()
+            raise
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self) -> "SfntReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.faces)
+
+    def _read_directories(self) -> list[dict[bytes, tuple[int, int]]]:
+        mm = self._mm
+        if mm[:4] == b"ttcf":
+            (num_fonts,) = struct.unpack_from(">I", mm, 8)
+            offsets = struct.unpack_from(f">{num_fonts}I", mm, 12)
+        else:
+            offsets = (0,)
+        faces = []
+        for offset in offsets:
+            if mm[offset : offset + 4] not in _SFNT_VERSIONS:
+                raise UnsupportedFont(f"unknown sfnt version at {offset}")
+            (num_tables,) = struct.unpack_from(">H", mm, offset + 4)
+            tables = {}
+            for i in range(num_tables):
+                tag, _, table_offset, length = struct.unpack_from(
+                    ">4sIII", mm, offset + 12 + 16 * i
+                )
+                if table_offset + length > len(mm):
+                    raise UnsupportedFont(f"table {tag!r} out of bounds")
+                tables[tag] = (table_offset, length)
+            faces.append(tables)
+        return faces
+
+    def table(self, font_number: int, tag: bytes) -> tuple[int, int] | None:
+        return self.faces[font_number].get(tag)
+
+    def name(self, font_number: int = 0) -> str:
+        entry = self.table(font_number, b"name")
+        if entry is None:
+            raise UnsupportedFont("no name table")
+        mm = self._mm
+        base, length = entry
+        try:
+            _, count, string_offset = struct.unpack_from(">HHH", mm, base)
+            if 6 + 12 * count > length:
+                raise UnsupportedFont("truncated name table")
+            records = [
+                struct.unpack_from(">HHHHHH", mm, base + 6 + 12 * i)
+                for i in range(count)
+            ]
+        except struct.error as e:
+            raise UnsupportedFont(f"truncated name table: {e}") from e
+        for platform_id, enc_id in NAME_PREFERENCES:
+            for pid, eid, _, name_id, length, offset in records:
+                if name_id == 4 and pid == platform_id and eid == enc_id:
+                    start = base + string_offset + offset
+                    try:
+                        return mm[start : start + length].decode("utf_16_be")
+                    except UnicodeDecodeError as e:
+                        raise UnsupportedFont(str(e)) from e
+        # 其他编码 (如 Mac Roman) 交给 fontTools 处理
+        raise UnsupportedFont("no unicode full name")
+
+    def flags(self, font_number: int = 0) -> tuple[bool, bool, bool]:
+        """
+        返回 (serif, italic, bold)，与 info._font_flags 的判定一致。
+        """
+        entry = self.table(font_number, b"OS/2")
+        if entry is None:
+            return False, False, False
+        offset, length = entry
+        if length < 64:
+            raise UnsupportedFont("short OS/2 table")
+        try:
+            (weight,) = struct.unpack_from(">H", self._mm, offset + 4)
+            (fs_selection,) = struct.unpack_from(">H", self._mm, offset + 62)
+        except struct.error as e:
+            raise UnsupportedFont(f"truncated OS/2 table: {e}") from e
+        return fs_selection & 0x2, fs_selection & 0x1, weight >= 500  # type: ignore
+
+    def num_glyphs(self, font_number: int = 0) -> int:
+        entry = self.table(font_number, b"maxp")
+        if entry is None:
+            raise UnsupportedFont("no maxp table")
+        try:
+            (count,) = struct.unpack_from(">H", self._mm, entry[0] + 4)
+        except struct.error as e:
+            raise UnsupportedFont(f"truncated maxp table: {e}") from e
+        return count
+
+    def cmap_entry(self, font_number: int = 0) -> tuple[int, int]:
+        entry = self.table(font_number, b"cmap")
+        if entry is None:
+            raise UnsupportedFont("no cmap table")
+        return entry
+
+    def coverage(self, font_number: int = 0) -> Coverage:
+        try:
+            return self._coverage(font_number)
+        except struct.error as e:
+            raise UnsupportedFont(f"truncated cmap: {e}") from e
+
+    def _coverage(self, font_number: int) -> Coverage:
+        mm = self._mm
+        base, length = self.cmap_entry(font_number)
+        end = base + length
+        (num_subtables,) = struct.unpack_from(">H", mm, base + 2)
+        subtables: dict[tuple[int, int], int] = {}
+        for i in range(num_subtables):
+            pid, eid, offset = struct.unpack_from(">HHI", mm, base + 4 + 8 * i)
+            # 与 fontTools getcmap 一致：同一 (platformID, platEncID) 取第一个
+            subtables.setdefault((pid, eid), base + offset)
+        for key in CMAP_PREFERENCES:
+            if key in subtables:
+                start = subtables[key]
+                break
+        else:
+            raise UnsupportedFont("no unicode cmap subtable")
+
+        # 格式 14 只描述变体序列 (UVS)，不影响按码位的覆盖，这里不需要读取
+        (fmt,) = struct.unpack_from(">H", mm, start)
+        num_glyphs = self.num_glyphs(font_number)
+        if fmt == 4:
+            runs = self._format4(start, end, num_glyphs)
+        elif fmt == 12 or fmt == 13:
+            runs = self._format12(start, end, num_glyphs, constant=fmt == 13)
+        else:
+            raise UnsupportedFont(f"cmap format {fmt}")
+        return Coverage.from_runs(runs)
+
+    def _format4(self, start: int, end: int, num_glyphs: int):
+        mm = self._mm
+        (seg_x2,) = struct.unpack_from(">H", mm, start + 6)
+        seg_count = seg_x2 // 2
+        pos = start + 14
+        end_codes = _be_array("H", mm[pos : pos + seg_x2])
+        pos += seg_x2 + 2  # reservedPad
+        start_codes = _be_array("H", mm[pos : pos + seg_x2])
+        pos += seg_x2
+        deltas = _be_array("H", mm[pos : pos + seg_x2])
+        pos += seg_x2
+        # idRangeOffset 与 glyphIdArray 连续存放，按 uint16 下标统一寻址；
+        # 子表自身的 length 字段在大字体里可能溢出，所以读到 cmap 表末尾
+        words = _be_array("H", mm[pos : end - (end - pos) % 2])
+        num_words = len(words)
+
+        for i in range(seg_count):
+            first, last = start_codes[i], end_codes[i]
+            if first > last:
+                continue
+            delta, range_offset = deltas[i], words[i]
+            if range_offset == 0:
+                gids = [(cp + delta) & 0xFFFF for cp in range(first, last + 1)]
+            else:
+                base = i + range_offset // 2 - first
+                gids = []
+                for cp in range(first, last + 1):
+                    idx = base + cp
+                    gid = words[idx] if idx < num_words else 0
+                    gids.append((gid + delta) & 0xFFFF if gid else 0)
+            yield first, array("H", [g if g < num_glyphs else 0 for g in gids])
+
+    def _format12(self, start: int, end: int, num_glyphs: int, constant: bool):
+        mm = self._mm
+        (num_groups,) = struct.unpack_from(">I", mm, start + 12)
+        pos = start + 16
+        if pos + 12 * num_groups > end:
+            raise UnsupportedFont("cmap groups out of bounds")
+        groups = _be_array("I", mm[pos : pos + 12 * num_groups])
+        if groups.itemsize != 4:
+            raise UnsupportedFont("no 32-bit array type")
+        for i in range(0, len(groups), 3):
+            first, last, gid = groups[i], min(groups[i + 1], MAX_UNICODE), groups[i + 2]
+            if first > last or gid >= num_glyphs:
+                continue
+            count = last - first + 1
+            if constant:
+                yield first, array("H", [gid]) * count
+            else:
+                count = min(count, num_glyphs - gid)
+                yield first, array("H", range(gid, gid + count))
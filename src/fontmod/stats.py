@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+
+if TYPE_CHECKING:
+    from fontmod.context import FontContext
+
+# 热路径的可选埋点：picker 各阶段命中计数、各阶段耗时、每次字体加载的路径/大小/耗时。
+# 默认关闭，关闭时每个埋点只多一次布尔判断；设置环境变量 FONTMOD_STATS=1 或调用 enable() 打开。
+
+enabled = os.environ.get("FONTMOD_STATS", "") not in ("", "0")
+
+# picker 解析一个字符时最终落在哪一步，按回退顺序排列
+STAGES = (
+    "user",  # 用户字体
+    "run",  # 沿用上一段的字体 (只在字符串解析中出现)
+    "memo",  # memo 命中
+    "negative",  # 负缓存命中
+    "script",  # 脚本字体
+    "boxes",
+    "emoji",
+    "math",
+    "music",
+    "symbol1",
+    "symbol2",
+    "miss",  # 没有字体能渲染
+)
+
+# 最多保留的字体加载记录条数
+MAX_LOADS = 1024
+
+
+@dataclass(frozen=True)
+class LoadRecord:
+    path: str
+    bytes: int
+    seconds: float
+    purpose: str
+
+
+_lock = threading.Lock()
+_stages: Counter[str] = Counter()
+# 名称 -> [次数, 总耗时, 最大耗时]
+_timers: dict[str, list] = {}
+_loads: deque[LoadRecord] = deque(maxlen=MAX_LOADS)
+_caches: dict[str, Callable] = {}
+
+
+def enable(on: bool = True):
+    global enabled
+    enabled = on
+
+
+def disable():
+    enable(False)
+
+
+def reset():
+    """
+    清空已收集的数据，不改变开关状态。
+    """
+    with _lock:
+        _stages.clear()
+        _timers.clear()
+        _loads.clear()
+
+
+def register_cache(name: str, fn: Callable):
+    """
+    登记一个 lru_cache 函数，stats() 会报告它的命中率。登记本身没有运行时开销。
+    """
+    _caches[name] = fn
+
+
+def hit(stage: str, n: int = 1):
+    with _lock:
+        _stages[stage] += n
+
+
+def add_time(name: str, seconds: float):
+    with _lock:
+        entry = _timers.get(name)
+        if entry is None:
+            _timers[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(name, time.perf_counter() - start)
+
+
+def record_load(path: Path, seconds: float, purpose: str, size: int | None = None):
+    if size is None:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = -1
+    add_time("load", seconds)
+    with _lock:
+        _loads.append(LoadRecord(str(path), size, seconds, purpose))
+
+
+def _rate(hits: int, misses: int) -> float | None:
+    total = hits + misses
+    return hits / total if total else None
+
+
+def stats(ctx: "FontContext | None" = None) -> dict:
+    """
+    当前数据的快照 (可直接 json.dumps)。传入 ctx 时附带它的 memo 命中率和负缓存大小。
+    """
+    with _lock:
+        stages = {stage: _stages.get(stage, 0) for stage in STAGES}
+        timers = {
+            name: {"count": count, "total_s": total, "max_s": peak}
+            for name, (count, total, peak) in sorted(_timers.items())
+        }
+        loads = [asdict(record) for record in _loads]
+
+    caches = {}
+    for name, fn in _caches.items():
+        info = fn.cache_info()
+        caches[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": _rate(info.hits, info.misses),
+            "size": info.currsize,
+        }
+
+    snapshot = {
+        "enabled": enabled,
+        "stages": stages,
+        "timers": timers,
+        "loads": loads,
+        "caches": caches,
+    }
+    if ctx is not None:
+        snapshot["context"] = {
+            "memo_hits": ctx.memo_hits,
+            "memo_misses": ctx.memo_misses,
+            "memo_hit_rate": _rate(ctx.memo_hits, ctx.memo_misses),
+            "memo_size": len(ctx.memo),
+            "negative": len(ctx.negative),
+        }
+    return snapshot
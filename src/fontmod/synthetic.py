@@ -0,0 +1,194 @@
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTCollection, TTFont
+
+# 合成字体语料：用 FontBuilder 批量生成 Noto 风格命名的 TTF/OTF/TTC，
+# 让枚举器、平台后端和 picker 可以脱离系统字体做测试和规模基准。
+
+
+@dataclass(frozen=True)
+class ScriptSpec:
+    script: str
+    # Noto 文件名中的脚本部分，如 NotoSans{stem}-Regular.ttf
+    stem: str
+    ranges: tuple[tuple[int, int], ...]
+
+
+SCRIPTS: dict[str, ScriptSpec] = {
+    spec.script: spec
+    for spec in (
+        ScriptSpec("Latn", "", ((0x20, 0x7E), (0xA0, 0x24F))),
+        ScriptSpec("Arab", "Arabic", ((0x600, 0x6FF), (0x750, 0x77F))),
+        ScriptSpec("Hebr", "Hebrew", ((0x591, 0x5F4),)),
+        ScriptSpec("Thai", "Thai", ((0xE01, 0xE5B),)),
+        ScriptSpec("Deva", "Devanagari", ((0x900, 0x97F),)),
+        ScriptSpec("Hani", "SC", ((0x4E00, 0x9FFF),)),
+        ScriptSpec("Hang", "KR", ((0xAC00, 0xD7A3),)),
+        # 含辅助平面码位，cmap 会用 format 12
+        ScriptSpec("Zsym", "Symbols2", ((0x2190, 0x21FF), (0x1F300, 0x1F5FF))),
+    )
+}
+
+FORMATS = ("ttf", "otf", "ttc")
+STYLES = ("Regular", "Bold", "Italic")
+
+
+def _codepoints(spec: ScriptSpec, cmap_size: int | None) -> list[int]:
+    cps = [cp for start, end in spec.ranges for cp in range(start, end + 1)]
+    return cps if cmap_size is None else cps[:cmap_size]
+
+
+def build_font(
+    path: Path,
+    family: str,
+    style: str = "Regular",
+    codepoints: Sequence[int] = range(0x41, 0x5B),
+    cff: bool = False,
+) -> Path:
+    """
+    生成一个最小可用的字体：每个码位一个 (共享轮廓的) 字形。cff=True 时生成 OTF (CFF)。
+    """
+    _save(_font(family, style, codepoints, cff), path)
+    return path
+
+
+def _font(family: str, style: str, codepoints: Sequence[int], cff: bool) -> TTFont:
+    glyph_order = [".notdef"] + [f"uni{cp:04X}" for cp in codepoints]
+    fb = FontBuilder(1000, isTTF=not cff)
+    fb.setupGlyphOrder(glyph_order)
+    fb.setupCharacterMap(dict(zip(codepoints, glyph_order[1:])))
+    if cff:
+        pen = T2CharStringPen(500, None)
+        _outline(pen)
+        charstring = pen.getCharString()
+        ps_name = f"{family}-{style}".replace(" ", "")
+        fb.setupCFF(
+            ps_name,
+            {"FullName": f"{family} {style}"},
+            {name: charstring for name in glyph_order},
+            {},
+        )
+    else:
+        pen = TTGlyphPen(None)
+        _outline(pen)
+        glyph = pen.glyph()
+        fb.setupGlyf({name: glyph for name in glyph_order})
+    fb.setupHorizontalMetrics({name: (500, 0) for name in glyph_order})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable(
+        {"familyName": family, "styleName": style, "fullName": f"{family} {style}"}
+    )
+    fs_selection = 0
+    if "Italic" in style:
+        fs_selection |= 0x1
+    if "Bold" in style:
+        fs_selection |= 0x20
+    if not fs_selection:
+        fs_selection = 0x40  # REGULAR
+    fb.setupOS2(usWeightClass=700 if "Bold" in style else 400, fsSelection=fs_selection)
+    # head.macStyle 与 OS/2.fsSelection 保持一致: bit 0 粗体，bit 1 斜体
+    fb.updateHead(macStyle=("Bold" in style) | ("Italic" in style) << 1)
+    fb.setupPost()
+    return fb.font
+
+
+def _outline(pen):
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 500))
+    pen.lineTo((500, 0))
+    pen.closePath()
+
+
+@lru_cache(maxsize=64)
+def _template(script: str, style: str, cmap_size: int | None, cff: bool) -> bytes:
+    font = _font("Template", style, _codepoints(SCRIPTS[script], cmap_size), cff)
+    buf = BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+def _renamed(template: bytes, family: str, style: str) -> TTFont:
+    # 只重写 name 表，其余表在保存时按原始字节复制，比每次都用 FontBuilder 重建快得多
+    font = TTFont(BytesIO(template))
+    name = font["name"]
+    name.names = []
+    name.setName(family, 1, 3, 1, 0x409)
+    name.setName(style, 2, 3, 1, 0x409)
+    name.setName(f"{family} {style}", 4, 3, 1, 0x409)
+    return font
+
+
+def _save(font: TTFont, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    font.save(str(path))
+
+
+def corpus_entry(index: int, scripts: Sequence[str]) -> tuple[str, str, str]:
+    """
+    第 `index` 个字体的 (脚本, 字族名, 样式)，文件名是去掉空格的 `{字族名}-{样式}`。
+
+    按脚本轮转，依次变化 Sans/Serif、样式，再往后给字族名加序号，保证同一语料内
+    文件名不重复；每个脚本的第一个字体使用标准的 Noto 文件名，平台后端按前缀就能找到。
+    """
+    script = scripts[index % len(scripts)]
+    n = index // len(scripts)
+    base = "Noto Serif" if n % 2 else "Noto Sans"
+    style = STYLES[(n // 2) % len(STYLES)]
+    variant = n // (2 * len(STYLES))
+    suffix = f"V{variant}" if variant else ""
+    family = " ".join(p for p in (base, SCRIPTS[script].stem, suffix) if p)
+    return script, family, style
+
+
+def generate_corpus(
+    root: str | Path,
+    count: int,
+    cmap_size: int | None = 256,
+    scripts: Iterable[str] = tuple(SCRIPTS),
+    formats: Iterable[str] = FORMATS,
+    per_dir: int = 1000,
+) -> list[Path]:
+    """
+    在 `root` 下生成 `count` 个字体文件，每 `per_dir` 个放一个子目录。
+
+    格式按 `formats` 轮转；TTC 文件包含该样式和 Bold 两个 face。
+    `cmap_size` 限制每个字体覆盖的码位数 (None 表示覆盖该脚本的全部范围)。
+    同样参数生成的语料完全相同。
+    """
+    root = Path(root)
+    scripts = tuple(scripts)
+    formats = tuple(formats)
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"unknown font formats: {sorted(unknown)}")
+
+    paths: list[Path] = []
+    for index in range(count):
+        script, family, style = corpus_entry(index, scripts)
+        fmt = formats[index % len(formats)]
+        filename = f"{family.replace(' ', '')}-{style}.{fmt}"
+        path = root / f"{index // per_dir:03d}" / filename
+        # 同一 (脚本, 样式, 格式) 的字形数据相同，只有名字不同，从模板改名即可
+        if fmt == "ttc":
+            collection = TTCollection()
+            collection.fonts = [
+                _renamed(_template(script, face, cmap_size, False), family, face)
+                for face in dict.fromkeys((style, "Bold"))
+            ]
+            path.parent.mkdir(parents=True, exist_ok=True)
+            collection.save(str(path), shareTables=True)
+        else:
+            template = _template(script, style, cmap_size, fmt == "otf")
+            _save(_renamed(template, family, style), path)
+        paths.append(path)
+        if (index + 1) % 1000 == 0:
+            logging.info(f"Generated {index + 1}/{count} fonts under {root}")
+    return paths
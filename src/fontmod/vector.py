@@ -0,0 +1,147 @@
+from array import array
+from typing import Sequence
+from weakref import WeakKeyDictionary
+
+from fontmod.context import FontContext
+from fontmod.coverage import PAGE_MASK, PAGE_SHIFT, PAGE_SIZE, Coverage
+from fontmod.info import FontInfo
+from fontmod.picker import (
+    SLOT_LOADERS,
+    _resolve_style,
+    fz_encode_character_with_system_font,
+    load_system_text_font,
+)
+from fontmod.script import script_of
+from fontmod.sfnt import MAX_UNICODE
+
+try:
+    import numpy as np
+except ImportError:  # numpy 是可选依赖，没有时退回逐码位的纯 Python 实现
+    np = None
+
+# Coverage -> (页号 -> 行号, 行号 -> 256 个 gid) 的 numpy 查找表
+_tables: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _lookup_table(coverage: Coverage):
+    table = _tables.get(coverage)
+    if table is None:
+        keys = sorted(coverage.pages)
+        rows = np.zeros((len(keys) + 1, PAGE_SIZE), dtype=np.uint16)
+        for row, key in enumerate(keys, start=1):
+            rows[row] = np.frombuffer(coverage.pages[key], dtype=np.uint16)
+        # 行 0 全为 0，没有覆盖的页都指向它，查找时无需再做掩码
+        page_rows = np.zeros((MAX_UNICODE >> PAGE_SHIFT) + 1, dtype=np.int32)
+        page_rows[keys] = np.arange(1, len(keys) + 1, dtype=np.int32)
+        table = _tables[coverage] = (page_rows, rows)
+    return table
+
+
+def _lookup(font: FontInfo, cps):
+    page_rows, rows = _lookup_table(font.coverage)
+    return rows[page_rows[cps >> PAGE_SHIFT], cps & PAGE_MASK]
+
+
+class _Resolver:
+    def __init__(self, cps):
+        self.cps = cps
+        # 超出 unicode 范围的码位查表会越界，始终保持 -1 (与纯 Python 实现一致)
+        self.valid = cps <= MAX_UNICODE
+        self.font_ids = np.full(len(cps), -1, dtype=np.int32)
+        self.gids = np.zeros(len(cps), dtype=np.uint16)
+        self.fonts: list[FontInfo] = []
+        self._ids: dict[int, int] = {}
+
+    def unresolved(self):
+        return np.flatnonzero((self.font_ids < 0) & self.valid)
+
+    def apply(self, font: FontInfo | None, idx):
+        if font is None or len(idx) == 0:
+            return
+        gids = _lookup(font, self.cps[idx])
+        hit = gids != 0
+        if not hit.any():
+            return
+        font_id = self._ids.get(id(font))
+        if font_id is None:
+            font_id = self._ids[id(font)] = len(self.fonts)
+            self.fonts.append(font)
+        self.font_ids[idx[hit]] = font_id
+        self.gids[idx[hit]] = gids[hit]
+
+
+def encode_codepoints(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    codepoints: Sequence[int],
+    is_serif: bool | None = None,
+    is_italic: bool | None = None,
+    is_bold: bool | None = None,
+):
+    """
+    批量解析码位，返回 (font_ids, gids, fonts)。
+
+    font_ids[i] 是 fonts 中的下标，-1 表示无法渲染；gids[i] 为对应的 gid。
+    回退顺序与 `fz_encode_character_with_system_font` 相同，
+    每一级只对尚未解析的码位做一次向量化查表。
+    安装了 numpy 时返回 numpy 数组，否则返回 array.array。
+    """
+    if np is None:
+        return _encode_codepoints_py(
+            ctx, user_font, codepoints, is_serif, is_italic, is_bold
+        )
+
+    is_serif, is_italic, is_bold = _resolve_style(
+        user_font, is_serif, is_italic, is_bold
+    )
+    cps = np.asarray(codepoints, dtype=np.uint32)
+    res = _Resolver(cps)
+    res.apply(user_font, res.unresolved())
+
+    idx = res.unresolved()
+    if len(idx):
+        uniq, inverse = np.unique(cps[idx], return_inverse=True)
+        scripts = [script_of(int(cp)) for cp in uniq]
+        names = sorted(set(scripts))
+        codes = np.array([names.index(s) for s in scripts], dtype=np.int32)[inverse]
+        for code, script in enumerate(names):
+            font = load_system_text_font(ctx, script, is_serif, is_bold, is_italic)
+            res.apply(font, idx[codes == code])
+
+    for loader in SLOT_LOADERS:
+        idx = res.unresolved()
+        if len(idx) == 0:
+            break
+        res.apply(loader(ctx), idx)
+
+    return res.font_ids, res.gids, res.fonts
+
+
+def _encode_codepoints_py(
+    ctx: FontContext,
+    user_font: FontInfo | None,
+    codepoints: Sequence[int],
+    is_serif: bool | None,
+    is_italic: bool | None,
+    is_bold: bool | None,
+):
+    font_ids = array("i")
+    gids = array("H")
+    fonts: list[FontInfo] = []
+    ids: dict[int, int] = {}
+    for cp in codepoints:
+        res = fz_encode_character_with_system_font(
+            ctx, user_font, int(cp), is_serif, is_italic, is_bold
+        )
+        if res is None:
+            font_ids.append(-1)
+            gids.append(0)
+            continue
+        font, gid = res
+        font_id = ids.get(id(font))
+        if font_id is None:
+            font_id = ids[id(font)] = len(fonts)
+            fonts.append(font)
+        font_ids.append(font_id)
+        gids.append(gid)
+    return font_ids, gids, fonts
@@ -0,0 +1,204 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Iterable
+from weakref import WeakSet
+
+from fontmod.context import FontContext
+from fontmod.enumerator import FontChanges, FontEnumerator
+from fontmod.platform import backend
+
+# inotify 事件位 (<sys/inotify.h>)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+# 原地覆盖写入不会改变目录 mtime，收到这些事件时需要逐个文件检查
+FULL_RESCAN_EVENTS = IN_CLOSE_WRITE | IN_ATTRIB | IN_Q_OVERFLOW
+
+# struct inotify_event: wd, mask, cookie, len，后跟 len 字节的文件名
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.fd: int = fd
+        self.wds: dict[int, Path] = {}
+
+    def watch(self, dir: Path):
+        # 对已监视的目录重复调用会返回同一个 wd
+        wd = self._add_watch(self.fd, os.fsencode(dir), WATCH_MASK | IN_ONLYDIR)
+        if wd >= 0:
+            self.wds[wd] = dir
+
+    def read(self) -> int:
+        """
+        读出所有待处理事件，返回它们的 mask 按位或。
+        """
+        masks = 0
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return masks
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size + length
+                masks |= mask
+                if mask & IN_IGNORED:  # 目录被删除，内核已自动移除监视
+                    self.wds.pop(wd, None)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FontWatcher:
+    """
+    后台线程监视 FontEnumerator 的字体目录：有变化时增量更新索引，
+    并让平台后端的文件索引和已注册 FontContext 中受影响的字体失效。
+
+    Linux 上使用 inotify (通过 ctypes)，其他平台或 inotify 不可用时定时轮询目录 mtime。
+    只有扫描时已存在的目录会被 inotify 监视；之后才创建的根目录需要 poll() 发现。
+    """
+
+    def __init__(
+        self,
+        enumerator: FontEnumerator,
+        contexts: Iterable[FontContext] = (),
+        interval: float = 2.0,
+        debounce: float = 0.2,
+        use_inotify: bool = True,
+    ):
+        self.enumerator = enumerator
+        self.contexts: WeakSet[FontContext] = WeakSet(contexts)
+        self.interval = interval
+        # 安装字体往往是一批文件，收到事件后稍等片刻，合并成一次扫描
+        self.debounce = debounce
+
+        self._inotify: _Inotify | None = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logging.warning(f"inotify unavailable, falling back to polling: {e}")
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def mode(self) -> str:
+        return "poll" if self._inotify is None else "inotify"
+
+    def add_context(self, ctx: FontContext):
+        self.contexts.add(ctx)
+
+    def poll(self, full: bool = False) -> FontChanges:
+        """
+        立即扫描一次并应用变化，后台线程也通过它更新。
+        """
+        with self._lock:
+            changes = self.enumerator.rescan(full)
+            if self._inotify is not None:
+                self._watch_dirs()
+            if changes:
+                self._invalidate(changes)
+        return changes
+
+    def _watch_dirs(self):
+        assert self._inotify is not None
+        watched = set(self._inotify.wds.values())
+        for dir in self.enumerator.scanned_dirs:
+            if dir not in watched:
+                self._inotify.watch(dir)
+
+    def _invalidate(self, changes: FontChanges):
+        logging.info(
+            f"Fonts changed: {len(changes.added)} added, {len(changes.removed)} removed"
+        )
+        # 后端按文件名缓存的目录索引已经过期，下次查找时重建
+        backend()._reset_font_index()
+        stale = {record.path for record in changes.removed}
+        for ctx in list(self.contexts):
+            ctx.invalidate(stale)
+
+    def start(self) -> "FontWatcher":
+        if self._thread is not None:
+            return self
+        if self._inotify is not None:
+            self._watch_dirs()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="fontmod-watch", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "FontWatcher":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self._inotify is None:
+                    if self._stop.wait(self.interval):
+                        return
+                    self.poll()
+                    continue
+
+                fd = self._inotify.fd
+                ready, _, _ = select.select([fd], [], [], self.interval)
+                if not ready:
+                    continue
+                mask = self._inotify.read()
+                if self._stop.wait(self.debounce):
+                    return
+                mask |= self._inotify.read()
+                self.poll(full=bool(mask & FULL_RESCAN_EVENTS))
+            except Exception as e:
+                logging.warning(f"Font watcher failed to rescan: {e}")
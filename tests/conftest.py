@@ -0,0 +1,65 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from fontmod.context import FontContext
+from fontmod.coverage import Coverage
+from fontmod.info import FontInfo
+from fontmod.platform.common import load_script_font, load_slot_font
+from fontmod.synthetic import build_font
+
+SLOTS = ("boxes", "emoji", "math", "music", "symbol1", "symbol2")
+
+
+def make_info(name: str, unicode2gid: dict[int, int]) -> FontInfo:
+    return FontInfo(
+        name=name,
+        path=Path(f"/nonexistent/{name}.ttf"),
+        is_bold=False,
+        is_italic=False,
+        is_serif=False,
+        _coverage=Coverage.from_dict(unicode2gid),
+    )
+
+
+def fake_backend(find_text_path) -> SimpleNamespace:
+    """
+    走 platform.common 加载流程的假平台后端：脚本字体路径由 `find_text_path(script)`
+    给出，所有槽位都找不到字体。
+    """
+    backend = SimpleNamespace(
+        load_system_text_font=lambda ctx, script, serif, bold, italic: load_script_font(
+            ctx, script, serif, bold, italic, lambda: find_text_path(script)
+        )
+    )
+    for slot in SLOTS:
+        setattr(
+            backend,
+            f"load_system_{slot}_font",
+            lambda ctx, slot=slot: load_slot_font(ctx, slot, lambda: None),
+        )
+    return backend
+
+
+@pytest.fixture
+def font_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "fonts"
+    build_font(root / "TestSans-Regular.ttf", "Test Sans")
+    build_font(root / "sub" / "TestSans-Bold.ttf", "Test Sans", style="Bold")
+    return root
+
+
+@pytest.fixture
+def offline_ctx() -> FontContext:
+    """
+    所有槽位都预先填好的 FontContext，picker 不会去访问系统字体目录。
+    """
+    ctx = FontContext()
+    for slot in SLOTS:
+        setattr(ctx, slot, make_info(slot, {}))
+    ctx.fallback["Latn"] = make_info(
+        "latin", {cp: cp - 0x40 for cp in range(0x41, 0x5B)}
+    )
+    ctx.fallback["Thai"] = make_info("thai", {0x0E01: 1, 0x0E02: 2})
+    return ctx
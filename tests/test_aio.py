@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from conftest import fake_backend
+from fontmod import aio, info, picker
+from fontmod.context import FontContext
+from fontmod.synthetic import build_font
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_warm_context_never_offloads(offline_ctx):
+    executor = CountingExecutor()
+    latin = offline_ctx.fallback["Latn"]
+    expected = picker.fz_encode_string_with_system_font(offline_ctx, None, "ABกข-")
+
+    async def run():
+        char = await aio.encode_character_with_system_font(
+            offline_ctx, None, 0x41, executor=executor
+        )
+        runs = await aio.encode_string_with_system_font(
+            offline_ctx, None, "ABกข-", executor=executor
+        )
+        return char, runs
+
+    char, runs = asyncio.run(run())
+    assert char == (latin, 1)
+    assert runs == expected
+    assert executor.submitted == 0
+
+
+def test_concurrent_loads_are_deduplicated(tmp_path: Path, monkeypatch):
+    latin = build_font(tmp_path / "Latin-Regular.ttf", family="Latin")
+    info._load_font_info.cache_clear()
+    finds: list[str] = []
+
+    def find(script: str):
+        finds.append(script)
+        return latin if script == "Latn" else None
+
+    backend = fake_backend(find)
+    monkeypatch.setattr(picker, "backend", lambda: backend)
+    ctx = FontContext(thread_safe=True)
+    executor = CountingExecutor()
+
+    async def run():
+        chars = [
+            aio.encode_character_with_system_font(ctx, None, cp, executor=executor)
+            for cp in range(0x41, 0x55)
+        ]
+        strings = [
+            aio.encode_string_with_system_font(ctx, None, "AB-", executor=executor)
+            for _ in range(5)
+        ]
+        return await asyncio.gather(*chars, *strings)
+
+    results = asyncio.run(run())
+    assert [r[1] for r in results[:20]] == list(range(1, 21))
+    assert results[0][0].name == "Latin Regular"
+    assert all(r == results[20] for r in results[20:])
+    assert results[20][-1].font is None
+    # Latn 与 Zyyy 的脚本字体各加载一次，槽位分派表构建一次
+    assert sorted(finds) == ["Latn", "Zyyy"]
+    assert executor.submitted == 3
+
+
+def test_loads_on_unsafe_context_are_serialized(tmp_path: Path, monkeypatch):
+    latin = build_font(tmp_path / "Latin-Regular.ttf", family="Latin")
+    info._load_font_info.cache_clear()
+    lock = threading.Lock()
+    active = [0]
+    overlaps: list[str] = []
+    finds: list[str] = []
+
+    def find(script: str):
+        with lock:
+            active[0] += 1
+            if active[0] > 1:
+                overlaps.append(script)
+        time.sleep(0.02)  # 放大竞争窗口
+        with lock:
+            active[0] -= 1
+        finds.append(script)
+        return latin if script == "Latn" else None
+
+    backend = fake_backend(find)
+    monkeypatch.setattr(picker, "backend", lambda: backend)
+    ctx = FontContext()
+    executor = CountingExecutor()
+
+    async def run():
+        # 不同样式、不同脚本的加载 key 各不相同，不会被去重合并
+        return await asyncio.gather(
+            aio.encode_string_with_system_font(ctx, None, "Aก", executor=executor),
+            aio.encode_string_with_system_font(
+                ctx, None, "Aα", is_bold=True, executor=executor
+            ),
+            aio.encode_character_with_system_font(
+                ctx, None, 0x5D0, is_serif=True, executor=executor
+            ),
+        )
+
+    asyncio.run(run())
+    assert overlaps == []
+    assert sorted(finds) == ["Grek", "Hebr", "Latn", "Thai"]
@@ -0,0 +1,33 @@
+import json
+import sys
+from pathlib import Path
+
+from fontmod.benchmark import bench_enumerator, bench_font_load, bench_scaling, run_all
+
+
+def test_enumerator_and_load(font_dir: Path):
+    enumerator = bench_enumerator([font_dir], repeat=1)
+    assert enumerator["fonts"] == 2
+    assert enumerator["cold_s"] > 0 and enumerator["warm_s"] > 0
+
+    loads = bench_font_load([font_dir], repeat=1)
+    assert loads["latin"]["path"].endswith(".ttf")
+    assert loads["cjk"] is None and loads["ttc"] is None
+
+
+def test_run_all_writes_json(font_dir: Path, tmp_path: Path):
+    output = tmp_path / "bench.json"
+    results = run_all(str(output), dirs=[font_dir], repeat=1)
+    assert json.loads(output.read_text()) == results
+    assert results["resolution"]["codepoints"] > 0
+    assert set(results) >= {"enumerator", "font_load", "resolution", "peak_rss_bytes"}
+
+
+def test_scaling_small_corpus():
+    results = bench_scaling(counts=(10,), cmap_size=64)
+    small = results["10"]
+    # 10 个文件，其中 TTC 含两个 face
+    assert small["faces"] > 10
+    assert small["enumerate_cold_s"] > 0 and small["index_build_s"] > 0
+    if sys.platform != "win32":
+        assert small["unix_backend"]["file_index_s"] > 0
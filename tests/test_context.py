@@ -0,0 +1,108 @@
+import threading
+import time
+from pathlib import Path
+
+from conftest import fake_backend
+from fontmod import info, picker
+from fontmod.context import FontContext
+from fontmod.synthetic import build_font
+
+THREADS = 16
+
+
+def _run_threads(fn, count: int = THREADS) -> list:
+    barrier = threading.Barrier(count)
+    results: list = [None] * count
+    errors: list[BaseException] = []
+
+    def worker(i: int):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+    return results
+
+
+def test_load_once_single_flight():
+    ctx = FontContext(thread_safe=True)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = _run_threads(lambda: ctx.load_once(("k",), load))
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert not ctx._flights
+
+
+def test_concurrent_text_resolution(tmp_path: Path, monkeypatch):
+    latin = build_font(tmp_path / "Latin-Regular.ttf", family="Latin")
+    info._load_font_info.cache_clear()
+
+    finds: list[str] = []
+    parses: list[Path] = []
+    load = info.FontInfo.load
+
+    def find(script: str):
+        finds.append(script)
+        time.sleep(0.02)  # 放大竞争窗口
+        return latin if script == "Latn" else None
+
+    def spy(path, lazy=False, font_number=0):
+        parses.append(Path(path))
+        return load(path, lazy, font_number)
+
+    backend = fake_backend(find)
+    monkeypatch.setattr(picker, "backend", lambda: backend)
+    monkeypatch.setattr(info.FontInfo, "load", spy)
+
+    ctx = FontContext(thread_safe=True)
+    text = "HELLO WORLD 123"
+    results = _run_threads(
+        lambda: picker.fz_encode_string_with_system_font(ctx, None, text)
+    )
+
+    assert all(r == results[0] for r in results)
+    assert results[0][0].font.name == "Latin Regular"
+    # 每个脚本只查找、解析一次
+    assert sorted(finds) == sorted(set(finds))
+    assert parses == [latin]
+
+
+def test_invalidate_publishes_new_structures(offline_ctx):
+    ctx = offline_ctx
+    latin = ctx.fallback["Latn"]
+    assert picker.fz_encode_character_with_system_font(ctx, None, 0x41) == (latin, 1)
+    memo, fallback, emoji = ctx.memo, ctx.fallback, ctx.emoji
+
+    ctx.invalidate([latin.path, emoji.path])
+    # 旧结构保持不变 (并发读者手里的引用不会被改到一半)，新结构整体替换
+    assert len(memo) == 1 and "Latn" in fallback
+    assert ctx.memo is not memo and not ctx.memo
+    assert list(ctx.fallback) == ["Thai"]
+    assert ctx.emoji is None and ctx.math is not None
+    assert ctx.dispatch is None and not ctx.negative
+
+
+def test_slot_assignment_replaces_memo(offline_ctx):
+    ctx = offline_ctx
+    latin = ctx.fallback["Latn"]
+    assert picker.fz_encode_character_with_system_font(ctx, None, 0x41) == (latin, 1)
+    memo = ctx.memo
+
+    ctx.math = latin
+    # 与 invalidate 一样换上新 memo，不原地清空并发读者手里的旧 memo
+    assert len(memo) == 1
+    assert ctx.memo is not memo and not ctx.memo
+    assert ctx.dispatch is None
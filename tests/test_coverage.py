@@ -0,0 +1,47 @@
+import pickle
+
+from fontmod.coverage import Coverage, page_bits
+
+
+def test_lookup_matches_dict():
+    u2g = {0x41: 1, 0x42: 2, 0x4E00: 300, 0x4E01: 301, 0x1F600: 7, 0x10FFFD: 9}
+    cov = Coverage.from_dict(u2g)
+    assert len(cov) == len(u2g)
+    for cp, gid in u2g.items():
+        assert cov.contains(cp)
+        assert cov.get_gid(cp) == gid
+    assert not cov.contains(0x43)
+    assert cov.get_gid(0x43) is None
+    assert cov.get_gid(0x2000) is None
+    assert dict(cov.items()) == u2g
+    assert list(cov.ranges()) == [
+        (0x41, 0x43),
+        (0x4E00, 0x4E02),
+        (0x1F600, 0x1F601),
+        (0x10FFFD, 0x10FFFE),
+    ]
+
+
+def test_notdef_is_not_coverage():
+    cov = Coverage.from_dict({0x41: 0, 0x42: 5})
+    assert not cov.contains(0x41)
+    assert len(cov) == 1
+
+
+def test_pickle_roundtrip():
+    cov = Coverage.from_dict({cp: cp - 0x4E00 + 1 for cp in range(0x4E00, 0x9FA6)})
+    restored = pickle.loads(pickle.dumps(cov))
+    assert len(restored) == len(cov)
+    assert dict(restored.items()) == dict(cov.items())
+
+
+def test_bitset_matches_codepoints():
+    u2g = {0x41: 1, 0x42: 2, 0xFF: 3, 0x4E00: 4, 0x1F600: 5}
+    cov = Coverage.from_dict(u2g)
+    bitset = cov.bitset()
+    assert bitset.bits == page_bits(u2g)
+    assert bitset.counts == {0: 3, 0x4E: 1, 0x1F6: 1}
+    assert cov.bitset() is bitset
+
+    full = Coverage.from_dict({cp: 1 for cp in range(0x100, 0x200)})
+    assert full.bitset().bits == {1: (1 << 256) - 1}
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from fontmod.enumerator import FontEnumerator
+from fontmod.info import FontInfo
+from fontmod.synthetic import build_font
+
+
+def test_warm_start_skips_parsing(font_dir: Path, tmp_path: Path, monkeypatch):
+    cache_path = tmp_path / "fonts.cache"
+    cold = FontEnumerator(dirs=[font_dir], cache_path=cache_path)
+    assert len(cold.font_records) == 2
+    assert cache_path.exists()
+
+    def fail(path, lazy=False):
+        raise AssertionError(f"unexpected parse of {path}")
+
+    monkeypatch.setattr(FontInfo, "load_faces", fail)
+    warm = FontEnumerator(dirs=[font_dir], cache_path=cache_path)
+    assert {r.path for r in warm.font_records} == {r.path for r in cold.font_records}
+    record = warm.get_font(font_dir / "TestSans-Regular.ttf")
+    assert record is not None
+    assert record.info.get_gid(0x41) == 1
+
+
+def test_cache_picks_up_added_and_removed(font_dir: Path, tmp_path: Path, monkeypatch):
+    cache_path = tmp_path / "fonts.cache"
+    FontEnumerator(dirs=[font_dir], cache_path=cache_path)
+
+    (font_dir / "sub" / "TestSans-Bold.ttf").unlink()
+    added = build_font(font_dir / "Other-Regular.ttf", family="Other")
+
+    parsed = []
+    load_faces = FontInfo.load_faces
+
+    def spy(path, lazy=False):
+        parsed.append(Path(path))
+        return load_faces(path, lazy)
+
+    monkeypatch.setattr(FontInfo, "load_faces", spy)
+    fe = FontEnumerator(dirs=[font_dir], cache_path=cache_path)
+    assert parsed == [added]
+    assert {r.path.name for r in fe.font_records} == {
+        "TestSans-Regular.ttf",
+        "Other-Regular.ttf",
+    }
+
+
+def test_parallel_matches_serial(font_dir: Path, tmp_path: Path):
+    (font_dir / "broken.ttf").write_bytes(b"not a font")
+    serial = FontEnumerator(dirs=[font_dir], use_cache=False)
+    parallel = FontEnumerator(dirs=[font_dir], use_cache=False, workers=2)
+    assert {(r.path, r.info.name) for r in parallel.font_records} == {
+        (r.path, r.info.name) for r in serial.font_records
+    }
+    assert len(parallel.font_records) == 2
@@ -1,25 +1,57 @@
+import sys
 from pathlib import Path
-from fontTools.ttLib import TTFont
-from fontmod.FontEnumerator import _get_ttfont_name
 
+import pytest
+from fontTools.ttLib import TTCollection, TTFont
 
-def _get_test_font_path() -> Path:
-    paths = [
-        "C:/Windows/Fonts/msyh.ttc",
-        "/usr/share/fonts/noto/NotoSans-Regular.ttf",
-        "/system/fonts/NotoSans-Regular.ttf",
+from fontmod.context import FontContext
+from fontmod.enumerator import FontEnumerator
+from fontmod.info import _font_name
+from fontmod.picker import fz_encode_string_with_system_font
+from fontmod.synthetic import generate_corpus
+
+
+def test_get_ttfont_name(tmp_path: Path):
+    # 依次生成 ttf / otf / ttc
+    for path in generate_corpus(tmp_path, 3):
+        if path.suffix.lower() in (".ttc", ".otc"):
+            font = TTFont(path, fontNumber=0)
+        else:
+            font = TTFont(path)
+        name = _font_name(font)
+        assert name is not None
+
+
+def test_enumerate_synthetic_corpus(tmp_path: Path):
+    paths = generate_corpus(tmp_path, 30, per_dir=10)
+    fe = FontEnumerator(dirs=[tmp_path], use_cache=False)
+
+    faces = sum(
+        len(TTCollection(path).fonts) if path.suffix == ".ttc" else 1 for path in paths
+    )
+    assert len(fe.font_records) == faces
+    assert set(fe.path_to_records) == set(paths)
+    record = fe.get_font_by_name("Noto Sans Arabic Regular")
+    assert record is not None
+    assert record.path.name == "NotoSansArabic-Regular.otf"
+    assert {r.info.name for r in fe.fonts_for_codepoint(0x0E01)} >= {
+        "Noto Sans Thai Regular"
+    }
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses the unix backend")
+def test_picker_on_synthetic_corpus(tmp_path: Path, monkeypatch):
+    from fontmod.platform import unix
+
+    generate_corpus(tmp_path, 16)
+    monkeypatch.setattr(unix, "_font_dirs", [tmp_path])
+    unix._reset_font_index()
+    try:
+        runs = fz_encode_string_with_system_font(FontContext(), None, "Abا")
+    finally:
+        unix._reset_font_index()
+
+    assert [(run.font.name, run.start, run.end) for run in runs] == [
+        ("Noto Sans Regular", 0, 2),
+        ("Noto Sans Arabic Regular", 2, 3),
     ]
-    for path in paths:
-        if Path(path).exists():
-            return Path(path)
-    raise FileNotFoundError("No test font found")
-
-
-def test_get_ttfont_name():
-    path = _get_test_font_path()
-    if path.suffix.lower() in (".ttc", ".otc"):
-        font = TTFont(path, fontNumber=0)
-    else:
-        font = TTFont(path)
-    name = _get_ttfont_name(font)
-    assert(name is not None)
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from fontmod.info import FontInfo
+from fontmod.synthetic import build_font
+
+
+def test_lazy_defers_cmap(tmp_path: Path):
+    path = build_font(tmp_path / "Lazy-Bold.ttf", family="Lazy", style="Bold")
+    lazy = FontInfo.load(path, lazy=True)
+    assert lazy.name == "Lazy Bold"
+    assert lazy.is_bold
+    assert not lazy.coverage_loaded
+
+    assert lazy.get_gid(0x42) == 2
+    assert lazy.coverage_loaded
+
+    eager = FontInfo.load(path)
+    assert eager.coverage_loaded
+    assert dict(eager.coverage.items()) == dict(lazy.coverage.items())
+
+
+def test_collection_faces(tmp_path: Path):
+    from fontTools.ttLib import TTCollection, TTFont
+
+    from fontmod.enumerator import FontEnumerator
+
+    regular = build_font(tmp_path / "src" / "Coll-Regular.ttf", family="Coll")
+    bold = build_font(tmp_path / "src" / "Coll-Bold.ttf", family="Coll", style="Bold")
+    collection = TTCollection()
+    collection.fonts = [TTFont(regular), TTFont(bold)]
+    path = tmp_path / "fonts" / "Coll.ttc"
+    path.parent.mkdir()
+    collection.save(path, shareTables=True)
+
+    faces = FontInfo.load_faces(path, lazy=True)
+    assert [(f.name, f.font_number, f.is_bold) for f in faces] == [
+        ("Coll Regular", 0, False),
+        ("Coll Bold", 1, True),
+    ]
+    assert FontInfo.load(path, font_number=1).name == "Coll Bold"
+    assert faces[1].get_gid(0x42) == 2
+    # cmap 完全相同的 face 共享同一份 Coverage
+    assert faces[0].coverage is faces[1].coverage
+
+    fe = FontEnumerator(dirs=[path.parent], use_cache=False)
+    assert len(fe.font_records) == 2
+    assert fe.get_font(path).info.font_number == 0
+    assert fe.get_font_by_name("Coll Bold").info.font_number == 1
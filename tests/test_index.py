@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from fontmod.enumerator import FontEnumerator
+from fontmod.index import CoverageIndex, iter_bits
+from fontmod.coverage import Coverage
+from fontmod.synthetic import build_font
+
+
+def test_candidates_and_removal():
+    index: CoverageIndex[str] = CoverageIndex()
+    index.add("latin", Coverage.from_dict({0x41: 1, 0x42: 2}))
+    index.add("thai", Coverage.from_dict({0x0E01: 1}))
+    index.add("both", Coverage.from_dict({0x43: 1, 0x0E02: 2}))
+
+    assert sorted(index.candidates(0x41)) == ["both", "latin"]
+    assert sorted(index.candidates(0x0E01)) == ["both", "thai"]
+    assert index.candidates(0x4E00) == []
+
+    index.remove("both")
+    assert index.candidates(0x0E01) == ["thai"]
+    index.add("cjk", Coverage.from_dict({0x4E00: 1}))
+    assert index.candidates(0x4E00) == ["cjk"]
+    assert len(index) == 3
+
+
+class _RecordingPages(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.touched: set[int] = set()
+
+    def __getitem__(self, page):
+        self.touched.add(page)
+        return super().__getitem__(page)
+
+    def __setitem__(self, page, bits):
+        self.touched.add(page)
+        super().__setitem__(page, bits)
+
+    def __delitem__(self, page):
+        self.touched.add(page)
+        super().__delitem__(page)
+
+
+def test_remove_touches_only_own_pages():
+    index: CoverageIndex[str] = CoverageIndex()
+    for page in range(64):
+        index.add(f"font{page}", Coverage.from_dict({page << 8: 1}))
+    index.add("two", Coverage.from_dict({0x41: 1, 0x0E01: 1}))
+
+    copy = index.copy()
+    copy.pages = _RecordingPages(copy.pages)
+    copy.remove("two")
+    assert copy.pages.touched == {0x00, 0x0E}
+    assert copy.candidates(0x41) == ["font0"]
+    assert "two" not in copy.item_pages
+    # 副本上的删除不影响原索引
+    assert sorted(index.candidates(0x41)) == ["font0", "two"]
+    assert index.item_pages["two"] == (0x00, 0x0E)
+
+
+def test_enumerator_index_updates_on_register(font_dir: Path, tmp_path: Path):
+    fe = FontEnumerator(dirs=[font_dir], use_cache=False)
+    assert {r.path.name for r in fe.fonts_for_codepoint(0x41)} == {
+        "TestSans-Regular.ttf",
+        "TestSans-Bold.ttf",
+    }
+    assert fe.fonts_for_codepoint(0x0E01) == []
+
+    thai_dir = tmp_path / "thai"
+    build_font(thai_dir / "Thai-Regular.ttf", family="Thai", codepoints=[0x0E01])
+    fe.register_font_dir(thai_dir)
+    assert [r.info.name for r in fe.fonts_for_codepoint(0x0E01)] == ["Thai Regular"]
+    assert fe.fonts_for_codepoint(0x0E02) == []
+
+
+def test_pick_best_fonts(tmp_path: Path):
+    root = tmp_path / "fonts"
+    build_font(root / "Latin-Regular.ttf", family="Latin")
+    build_font(root / "Latin-Bold.ttf", family="Latin", style="Bold")
+    build_font(root / "Half-Regular.ttf", family="Half", codepoints=range(0x41, 0x4E))
+    build_font(root / "Thai-Regular.ttf", family="Thai", codepoints=[0x0E01])
+    fe = FontEnumerator(dirs=[root], use_cache=False)
+
+    ranked = fe.pick_best_fonts("ABN ก", top_k=None)
+    assert [(r.info.name, score) for r, score in ranked] == [
+        ("Latin Regular", 0.75),
+        ("Latin Bold", 0.75),
+        ("Half Regular", 0.5),
+        ("Thai Regular", 0.25),
+    ]
+    # 覆盖率相同时按样式要求排序
+    best = fe.pick_best_fonts("ABN", top_k=1, bold=True)
+    assert [(r.info.name, score) for r, score in best] == [("Latin Bold", 1.0)]
+
+    full = fe.pick_best_fonts("ABN", require_full=True)
+    assert [r.info.name for r, _ in full] == ["Latin Regular", "Latin Bold"]
+    assert fe.pick_best_fonts("ABN ก", require_full=True) == []
+    assert fe.pick_best_fonts(" \n\t") == []
+    assert fe.pick_best_fonts("中") == []
+
+
+def test_pick_best_fonts_same_name_faces(tmp_path: Path):
+    from fontTools.ttLib import TTCollection, TTFont
+
+    faces = [build_font(tmp_path / f"face{i}.ttf", family="Twin") for i in range(2)]
+    collection = TTCollection()
+    collection.fonts = [TTFont(str(path)) for path in faces]
+    root = tmp_path / "fonts"
+    root.mkdir()
+    collection.save(str(root / "Twin.ttc"))
+
+    fe = FontEnumerator(dirs=[root], use_cache=False)
+    ranked = fe.pick_best_fonts("AB", top_k=None)
+    assert [r.info.font_number for r, _ in ranked] == [0, 1]
+    assert len(fe.pick_best_fonts("AB", top_k=1)) == 1
+
+
+def test_iter_bits():
+    assert list(iter_bits(0)) == []
+    assert list(iter_bits(0b10110)) == [1, 2, 4]
+    assert list(iter_bits(1 << 5000 | 1)) == [0, 5000]
+    assert list(iter_bits((1 << 3000) - 1)) == list(range(3000))
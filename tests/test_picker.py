@@ -0,0 +1,143 @@
+import time
+from pathlib import Path
+
+from conftest import fake_backend, make_info
+from fontmod import info, picker
+from fontmod.context import SLOTS, FontContext
+from fontmod.platform.common import load_slot_font
+from fontmod.picker import (
+    FontRun,
+    fz_encode_character_with_system_font,
+    fz_encode_string_with_system_font,
+)
+from fontmod.synthetic import build_font
+
+
+def test_string_runs(offline_ctx):
+    user = make_info("user", {0x41: 7})
+    runs = fz_encode_string_with_system_font(offline_ctx, user, "ABCกข-A")
+    latin = offline_ctx.fallback["Latn"]
+    thai = offline_ctx.fallback["Thai"]
+    assert runs == [
+        FontRun(user, [7], 0, 1),
+        FontRun(latin, [2, 3], 1, 3),
+        FontRun(thai, [1, 2], 3, 5),
+        FontRun(None, [0], 5, 6),
+        FontRun(user, [7], 6, 7),
+    ]
+
+
+def test_string_matches_characters(offline_ctx):
+    text = "HELLOก"
+    runs = fz_encode_string_with_system_font(offline_ctx, None, text)
+    flat = [(run.font, gid) for run in runs for gid in run.gids]
+    for (font, gid), ch in zip(flat, text):
+        assert fz_encode_character_with_system_font(offline_ctx, None, ord(ch)) == (
+            font,
+            gid,
+        )
+
+
+def test_memo_caches_hits_and_misses(offline_ctx):
+    offline_ctx.memo_size = 2
+    ctx = offline_ctx
+    latin = ctx.fallback["Latn"]
+    assert fz_encode_character_with_system_font(ctx, None, 0x41) == (latin, 1)
+    assert fz_encode_character_with_system_font(ctx, None, 0x41) == (latin, 1)
+    assert (ctx.memo_hits, ctx.memo_misses) == (1, 1)
+
+    # 负结果同样缓存
+    assert fz_encode_character_with_system_font(ctx, None, 0x2D) is None
+    assert fz_encode_character_with_system_font(ctx, None, 0x2D) is None
+    assert (ctx.memo_hits, ctx.memo_misses) == (2, 2)
+
+    # 容量为 2，最久未使用的 0x41 被淘汰
+    fz_encode_character_with_system_font(ctx, None, 0x42)
+    assert len(ctx.memo) == 2
+    fz_encode_character_with_system_font(ctx, None, 0x41)
+    assert ctx.memo_misses == 4
+
+    # 不同的 user_font 不共享结果
+    user = make_info("user", {0x41: 7})
+    assert fz_encode_character_with_system_font(ctx, user, 0x41) == (user, 7)
+
+
+def test_slot_dispatch(offline_ctx):
+    ctx = offline_ctx
+    ctx.emoji = make_info("emoji", {0x1F600: 3})
+    ctx.math = make_info("math", {0x2211: 4, 0x2190: 5})
+    ctx.symbol1 = make_info("symbol1", {0x2190: 6, 0x2605: 7})
+    assert fz_encode_character_with_system_font(ctx, None, 0x1F600) == (ctx.emoji, 3)
+    assert ctx.dispatch is not None
+    # 只加载到能渲染该码位的槽位为止
+    assert ctx.dispatch.loaded == 2
+    assert ctx.dispatch[0x1F6] == (ctx.emoji,)
+    assert 0x21 not in ctx.dispatch
+    # math 在前，优先命中
+    assert fz_encode_character_with_system_font(ctx, None, 0x2190) == (ctx.math, 5)
+    assert ctx.dispatch[0x21] == (ctx.math,)
+    assert fz_encode_character_with_system_font(ctx, None, 0x2605) == (ctx.symbol1, 7)
+    assert ctx.dispatch[0x21] == (ctx.math, ctx.symbol1)
+    assert ctx.dispatch.loaded == 5
+    # 所有槽位都无法渲染时才记为找不到
+    assert fz_encode_character_with_system_font(ctx, None, 0x2606) is None
+    assert ctx.dispatch.loaded == len(SLOTS)
+
+    # 替换槽位后分派表失效并重建
+    ctx.math = make_info("math2", {})
+    assert ctx.dispatch is None
+    assert fz_encode_character_with_system_font(ctx, None, 0x2190) == (ctx.symbol1, 6)
+
+
+def test_slots_load_lazily(tmp_path: Path, monkeypatch):
+    emoji = build_font(tmp_path / "Emoji-Regular.ttf", "Emoji", codepoints=[0x1F600])
+    info.clear_caches()
+    loaded: list[str] = []
+
+    def slot_loader(slot: str):
+        def load(ctx):
+            loaded.append(slot)
+            return load_slot_font(ctx, slot, lambda: emoji if slot == "emoji" else None)
+
+        return load
+
+    backend = fake_backend(lambda script: None)
+    for slot in SLOTS:
+        setattr(backend, f"load_system_{slot}_font", slot_loader(slot))
+    monkeypatch.setattr(picker, "backend", lambda: backend)
+
+    ctx = FontContext()
+    found = fz_encode_character_with_system_font(ctx, None, 0x1F600)
+    assert found is not None and found[0] is ctx.emoji
+    # emoji 之后的槽位字体还没有加载
+    assert loaded == ["boxes", "emoji"]
+    assert fz_encode_character_with_system_font(ctx, None, 0x2211) is None
+    assert loaded == list(SLOTS)
+
+
+def test_negative_ttl_retries_after_install(tmp_path: Path, monkeypatch):
+    installed: dict[str, Path] = {}
+    backend = fake_backend(lambda script: installed.get(script))
+    backend.load_system_math_font = lambda ctx: load_slot_font(
+        ctx, "math", lambda: installed.get("math")
+    )
+    monkeypatch.setattr(picker, "backend", lambda: backend)
+    info.clear_caches()
+
+    ctx = FontContext(negative_ttl=0.05)
+    assert fz_encode_character_with_system_font(ctx, None, 0x41) is None
+    assert fz_encode_character_with_system_font(ctx, None, 0x2211) is None
+    assert ctx.dispatch is not None
+
+    installed["Latn"] = build_font(tmp_path / "Latin-Regular.ttf", "Latin")
+    installed["math"] = build_font(
+        tmp_path / "Math-Regular.ttf", "Math", codepoints=[0x2211]
+    )
+    # 负缓存过期前仍然返回 None
+    assert fz_encode_character_with_system_font(ctx, None, 0x41) is None
+    time.sleep(0.06)
+    found = fz_encode_character_with_system_font(ctx, None, 0x41)
+    assert found is not None and found[0].name == "Latin Regular"
+    # 分派表建立时缺少 math 槽位，过期后重建并重新查找槽位
+    found = fz_encode_character_with_system_font(ctx, None, 0x2211)
+    assert found is not None and found[0] is ctx.math
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import pytest
+
+from fontmod.context import FontContext
+from fontmod.platform import unix
+from fontmod.synthetic import build_font
+
+
+@pytest.fixture
+def noto_dir(tmp_path: Path, monkeypatch):
+    for name in [
+        "noto/NotoSans-Regular.ttf",
+        "noto/NotoSansThai-Regular.ttf",
+        "noto/NotoSansThaiLooped-Regular.ttf",
+        "cjk/NotoSansCJK-Regular.ttc",
+        "emoji/NotoColorEmoji.ttf",
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    monkeypatch.setattr(unix, "_font_dirs", [tmp_path])
+    unix._reset_font_index()
+    yield tmp_path
+    unix._reset_font_index()
+
+
+def test_stem_lookup_uses_single_walk(noto_dir: Path, monkeypatch):
+    walks = []
+    font_files = unix._font_files
+
+    def spy(paths):
+        walks.append(paths)
+        return font_files(paths)
+
+    monkeypatch.setattr(unix, "_font_files", spy)
+
+    assert unix._load_noto("NotoSans", "Thai", "-Regular") == (
+        noto_dir / "noto/NotoSansThai-Regular.ttf"
+    )
+    assert unix._load_noto("NotoColorEmoji", "", "") == (
+        noto_dir / "emoji/NotoColorEmoji.ttf"
+    )
+    assert unix._load_noto_cjk("Hani") == noto_dir / "cjk/NotoSansCJK-Regular.ttc"
+    assert unix._load_noto("NotoSans", "Lao", "-Regular") is None
+    assert unix._load_noto("NotoSans", "", "-Regular") == (
+        noto_dir / "noto/NotoSans-Regular.ttf"
+    )
+    assert len(walks) == 1
+
+
+def test_negative_cache(noto_dir: Path, monkeypatch):
+    calls = []
+    text_font_path = unix._text_font_path
+
+    def spy(*args):
+        calls.append(args)
+        return text_font_path(*args)
+
+    monkeypatch.setattr(unix, "_text_font_path", spy)
+
+    # 文件存在但不是合法字体：加载失败后不再重试
+    ctx = FontContext()
+    assert unix.load_system_text_font(ctx, "Thai", False, False, False) is None
+    assert unix.load_system_text_font(ctx, "Thai", False, False, False) is None
+    assert unix.load_system_text_font(ctx, "Zyyy", False, False, False) is None
+    assert unix.load_system_text_font(ctx, "Zyyy", False, False, False) is None
+    assert len(calls) == 2
+    assert ctx.is_negative(("script", "Thai", False, False, False))
+    assert ctx.is_negative(("path", noto_dir / "noto/NotoSansThai-Regular.ttf"))
+
+    assert unix.load_system_emoji_font(ctx) is None
+    assert ctx.is_negative(("slot", "emoji"))
+
+    # 设置了 TTL 时过期后会重新查找
+    ctx = FontContext(negative_ttl=0.0)
+    unix.load_system_text_font(ctx, "Thai", False, False, False)
+    unix.load_system_text_font(ctx, "Thai", False, False, False)
+    assert len(calls) == 4
+
+
+def test_script_negative_cache_is_per_style(tmp_path: Path, monkeypatch):
+    build_font(
+        tmp_path / "NotoSansCJK-Regular.ttf", "Noto Sans CJK", codepoints=[0x4E00]
+    )
+    monkeypatch.setattr(unix, "_font_dirs", [tmp_path])
+    unix._reset_font_index()
+    try:
+        ctx = FontContext()
+        # 找不到 serif 字体不影响之后查找 sans 字体
+        assert unix.load_system_text_font(ctx, "Hani", True, False, False) is None
+        font = unix.load_system_text_font(ctx, "Hani", False, False, False)
+        assert font is not None and font.name == "Noto Sans CJK Regular"
+    finally:
+        unix._reset_font_index()
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from fontmod.platform import windows
+
+
+@pytest.fixture
+def windows_fonts(tmp_path: Path, monkeypatch):
+    for name in ["segoeui.ttf", "SEGOEUIB.TTF", "sub/DUBAI-REGULAR.TTF", "msyh.ttc"]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    monkeypatch.setattr(windows, "_font_dirs", [tmp_path])
+    windows._reset_font_index()
+    yield tmp_path
+    windows._reset_font_index()
+
+
+def test_filename_map_is_case_insensitive(windows_fonts: Path, monkeypatch):
+    walks = []
+    font_files = windows._font_files
+
+    def spy(paths):
+        walks.append(paths)
+        return font_files(paths)
+
+    monkeypatch.setattr(windows, "_font_files", spy)
+
+    assert windows._load_font("Segoe UI") == windows_fonts / "segoeui.ttf"
+    assert windows._load_font("Segoe UI Bold") == windows_fonts / "SEGOEUIB.TTF"
+    assert windows._load_font("Dubai Regular") == (
+        windows_fonts / "sub/DUBAI-REGULAR.TTF"
+    )
+    # 没有 segoeuiz.ttf 时回退到常规字重
+    assert windows._load_family("Segoe UI", bold=True, italic=True) == (
+        windows_fonts / "segoeui.ttf"
+    )
+    assert windows._load_families(["Arial", "msyh"]) == windows_fonts / "msyh.ttc"
+    assert windows._load_font("Arial") is None
+    assert len(walks) == 1
@@ -0,0 +1,57 @@
+import importlib
+import pstats
+import tomllib
+from pathlib import Path
+
+import pytest
+
+from fontmod.info import FontInfo
+from fontmod.profiling import font_info_footprint, profile
+from fontmod.synthetic import build_font
+
+
+def test_profile_load_writes_pstats(tmp_path: Path, capsys):
+    font = build_font(tmp_path / "TestSans-Regular.ttf", "Test Sans")
+    output = tmp_path / "load.pstats"
+    profile("load", target=str(font), top=5, output=str(output))
+
+    out = capsys.readouterr().out
+    assert "== cProfile: load" in out and "== tracemalloc: load" in out
+    assert "fontmod.coverage" in out
+    assert "Test Sans Regular#0" in out
+    assert pstats.Stats(str(output)).total_calls > 0
+
+
+def test_profile_enumerate(font_dir: Path, capsys):
+    profile("enumerate", dirs=[str(font_dir)], cpu=False)
+    out = capsys.readouterr().out
+    assert "== cProfile" not in out
+    assert "2 fonts" in out
+
+
+def test_font_info_footprint(tmp_path: Path):
+    font = FontInfo.load(build_font(tmp_path / "TestSans-Regular.ttf", "Test Sans"))
+    footprint = font_info_footprint(font)
+    assert footprint["codepoints"] == 26 and footprint["pages"] == 1
+    assert footprint["coverage_bytes"] > 2 * 256
+    assert footprint["object_bytes"] > 0
+
+
+def test_unknown_workload():
+    with pytest.raises(ValueError):
+        profile("nope")
+    with pytest.raises(ValueError):
+        profile("load")
+
+
+def test_console_script_profile(tmp_path: Path, capsys):
+    pyproject = Path(__file__).parents[1] / "pyproject.toml"
+    scripts = tomllib.loads(pyproject.read_text())["project"]["scripts"]
+    module, _, attr = scripts["fontmod"].partition(":")
+    entry = getattr(importlib.import_module(module), attr)
+
+    font = build_font(tmp_path / "TestSans-Regular.ttf", "Test Sans")
+    entry(["profile", "load", "--target", str(font), "--cpu=False"])
+    out = capsys.readouterr().out
+    assert "== tracemalloc: load" in out
+    assert "Test Sans Regular#0" in out
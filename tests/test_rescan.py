@@ -0,0 +1,104 @@
+import os
+import shutil
+from pathlib import Path
+
+from fontmod.enumerator import FontEnumerator
+from fontmod.synthetic import build_font
+
+
+def _spy_listing(monkeypatch) -> list[Path]:
+    listed: list[Path] = []
+    list_dir = FontEnumerator._list_dir
+
+    def spy(dir: Path):
+        listed.append(dir)
+        return list_dir(dir)
+
+    monkeypatch.setattr(FontEnumerator, "_list_dir", staticmethod(spy))
+    return listed
+
+
+def test_register_scans_only_new_dir(font_dir: Path, tmp_path: Path, monkeypatch):
+    fe = FontEnumerator(dirs=[font_dir], use_cache=False)
+    other = tmp_path / "other"
+    build_font(other / "Other-Regular.ttf", family="Other")
+
+    listed = _spy_listing(monkeypatch)
+    changes = fe.register_font_dir(other)
+    assert listed == [other.resolve()]
+    assert [r.info.name for r in changes.added] == ["Other Regular"]
+    assert fe.get_font_by_name("Other Regular") is not None
+    assert len(fe.font_records) == 3
+
+
+def test_rescan_applies_deltas(font_dir: Path, monkeypatch):
+    fe = FontEnumerator(dirs=[font_dir], use_cache=False)
+    assert fe.fonts_for_codepoint(0x41)  # 先建好索引，验证增量更新
+    listed = _spy_listing(monkeypatch)
+
+    # 没有变化：只 stat 目录，不重新列出
+    assert not fe.rescan()
+    assert listed == []
+
+    # 在子目录新增字体：只列出子目录
+    build_font(font_dir / "sub" / "TestSans-Regular.ttf", "Test Sans")
+    changes = fe.rescan()
+    assert listed == [font_dir / "sub"]
+    assert [r.path.name for r in changes.added] == ["TestSans-Regular.ttf"]
+    assert not changes.removed
+    assert fe.name_to_paths["Test Sans Regular"] == [
+        font_dir / "TestSans-Regular.ttf",
+        font_dir / "sub" / "TestSans-Regular.ttf",
+    ]
+    assert len(fe.fonts_for_codepoint(0x41)) == 3
+
+    # 删除整个子目录
+    shutil.rmtree(font_dir / "sub")
+    changes = fe.rescan()
+    assert {r.path.name for r in changes.removed} == {
+        "TestSans-Regular.ttf",
+        "TestSans-Bold.ttf",
+    }
+    assert fe.get_font_by_name("Test Sans Bold") is None
+    assert fe.name_to_paths == {
+        "Test Sans Regular": [font_dir / "TestSans-Regular.ttf"]
+    }
+    assert fe.get_font_by_name("Test Sans Regular").path == (
+        font_dir / "TestSans-Regular.ttf"
+    )
+    assert [r.path for r in fe.fonts_for_codepoint(0x41)] == [
+        font_dir / "TestSans-Regular.ttf"
+    ]
+
+
+def test_rescan_full_detects_in_place_changes(font_dir: Path):
+    fe = FontEnumerator(dirs=[font_dir], use_cache=False)
+    path = font_dir / "TestSans-Regular.ttf"
+    dir_mtime = os.stat(font_dir).st_mtime_ns
+
+    # 原地覆盖：目录 mtime 不变，增量扫描看不到
+    build_font(path, family="Renamed", codepoints=range(0x30, 0x3A))
+    os.utime(font_dir, ns=(dir_mtime, dir_mtime))
+    assert not fe.rescan()
+
+    changes = fe.rescan(full=True)
+    assert [r.info.name for r in changes.added] == ["Renamed Regular"]
+    assert [r.info.name for r in changes.removed] == ["Test Sans Regular"]
+    assert "Test Sans Regular" not in fe.name_to_paths
+    assert fe.get_font(path).info.name == "Renamed Regular"
+    assert fe.get_font(path).info.get_gid(0x30) == 1
+
+
+def test_rescan_removes_deleted_root(font_dir: Path):
+    fe = FontEnumerator(dirs=[font_dir], use_cache=False)
+    assert len(fe.font_records) == 2
+
+    shutil.rmtree(font_dir)
+    changes = fe.rescan()
+    assert sorted(r.path.name for r in changes.removed) == [
+        "TestSans-Bold.ttf",
+        "TestSans-Regular.ttf",
+    ]
+    assert not fe.font_records and not fe.path_to_records
+    assert fe.scanned_dirs == []
+    assert not fe.rescan(full=True)
@@ -0,0 +1,17 @@
+import fontTools.unicodedata
+
+from fontmod.script import MAX_UNICODE, script_of
+
+
+def test_matches_fonttools_everywhere():
+    mismatches = [
+        cp
+        for cp in range(MAX_UNICODE + 1)
+        if script_of(cp) != fontTools.unicodedata.script(cp)
+    ]
+    assert mismatches == []
+
+
+def test_out_of_range():
+    assert script_of(MAX_UNICODE + 1) == "Zzzz"
+    assert script_of(-1) == "Zzzz"
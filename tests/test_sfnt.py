@@ -0,0 +1,88 @@
+import struct
+from pathlib import Path
+
+import pytest
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables._c_m_a_p import CmapSubtable
+
+from fontmod.info import FontInfo, _unicode2gid_map
+from fontmod.sfnt import SfntReader, UnsupportedFont
+from fontmod.synthetic import build_font
+
+
+def _reference(path: Path) -> dict[int, int]:
+    with TTFont(path, lazy=True) as tt:
+        return {cp: gid for cp, gid in _unicode2gid_map(tt).items() if gid}
+
+
+@pytest.mark.parametrize(
+    "codepoints",
+    [
+        range(0x41, 0x5B),  # format 4
+        [0x20, 0x41, 0x4E00, 0x4E01, 0xFFFD],  # format 4，多段
+        [0x41, 0x1F600, 0x1F601, 0x20000],  # format 12
+    ],
+)
+def test_matches_fonttools(tmp_path: Path, codepoints):
+    path = build_font(
+        tmp_path / "Fast-Regular.ttf", family="Fast", codepoints=codepoints
+    )
+    with SfntReader(path) as reader:
+        assert len(reader) == 1
+        assert reader.name() == "Fast Regular"
+        assert dict(reader.coverage().items()) == _reference(path)
+
+
+def test_unusual_cmap_falls_back(tmp_path: Path):
+    path = build_font(tmp_path / "Six-Regular.ttf", family="Six")
+    tt = TTFont(path)
+    subtable = CmapSubtable.newSubtable(6)
+    subtable.platformID, subtable.platEncID, subtable.language = 3, 1, 0
+    subtable.cmap = tt.getBestCmap()
+    tt["cmap"].tables = [subtable]
+    tt.save(path)
+
+    with SfntReader(path) as reader:
+        with pytest.raises(UnsupportedFont):
+            reader.coverage()
+    info = FontInfo.load(path)
+    assert info.get_gid(0x42) == 2
+
+
+def test_not_a_font(tmp_path: Path):
+    path = tmp_path / "broken.ttf"
+    path.write_bytes(b"not a font at all")
+    with pytest.raises(UnsupportedFont):
+        SfntReader(path)
+
+
+def _truncate_table(path: Path, tag: bytes, keep: int):
+    """
+    把 `tag` 表的目录项改成指向文件末尾的 `keep` 个字节，模拟截断的表。
+    """
+    data = bytearray(path.read_bytes())
+    (num_tables,) = struct.unpack_from(">H", data, 4)
+    for i in range(num_tables):
+        entry = 12 + 16 * i
+        if data[entry : entry + 4] == tag:
+            struct.pack_into(">II", data, entry + 8, len(data) - keep, keep)
+            break
+    else:
+        raise AssertionError(f"no {tag!r} table")
+    path.write_bytes(bytes(data))
+
+
+@pytest.mark.parametrize(
+    "tag, read",
+    [
+        (b"name", SfntReader.name),
+        (b"OS/2", SfntReader.flags),
+        (b"maxp", SfntReader.num_glyphs),
+    ],
+)
+def test_truncated_table(tmp_path: Path, tag: bytes, read):
+    path = build_font(tmp_path / "Cut-Regular.ttf", family="Cut")
+    _truncate_table(path, tag, keep=4)
+    with SfntReader(path) as reader:
+        with pytest.raises(UnsupportedFont):
+            read(reader)
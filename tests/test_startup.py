@@ -0,0 +1,56 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from fontmod.benchmark import bench_import_time
+from fontmod.enumerator import FontEnumerator
+
+
+def test_import_picker_stays_light():
+    result = bench_import_time("fontmod.picker", repeat=1)
+    assert result["heavy_modules"] == []
+    assert result["ok"], result
+
+
+def test_warm_index_does_not_import_fonttools(font_dir: Path, tmp_path: Path):
+    cache_path = tmp_path / "fonts.cache"
+    FontEnumerator(dirs=[font_dir], cache_path=cache_path)
+
+    script = f"""
+import sys
+from fontmod.enumerator import FontEnumerator
+
+fe = FontEnumerator(dirs=[{str(font_dir)!r}], cache_path={str(cache_path)!r})
+assert [r.info.name for r in fe.fonts_for_codepoint(0x41)]
+print(sorted(m for m in sys.modules if m.startswith("fontTools")))
+"""
+    proc = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == "[]"
+
+
+def test_first_resolve_does_not_import_fonttools(font_dir: Path):
+    font = font_dir / "TestSans-Regular.ttf"
+    script = f"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from fontmod import picker
+from fontmod.context import FontContext
+from fontmod.platform.common import load_script_font
+
+picker.backend = lambda: SimpleNamespace(
+    load_system_text_font=lambda ctx, script, serif, bold, italic: load_script_font(
+        ctx, script, serif, bold, italic, lambda: Path({str(font)!r})
+    )
+)
+font, gid = picker.fz_encode_character_with_system_font(FontContext(), None, 0x41)
+assert font.name == "Test Sans Regular" and gid, (font, gid)
+print(sorted(m for m in sys.modules if m.startswith("fontTools")))
+"""
+    proc = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert proc.stdout.strip() == "[]"
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from conftest import fake_backend, make_info
+from fontmod import info, picker, stats
+from fontmod.context import FontContext
+from fontmod.synthetic import build_font
+
+
+@pytest.fixture
+def enabled_stats():
+    stats.reset()
+    stats.enable()
+    yield stats
+    stats.disable()
+    stats.reset()
+
+
+def test_disabled_by_default_collects_nothing(offline_ctx):
+    stats.reset()
+    assert not stats.enabled
+    picker.fz_encode_string_with_system_font(offline_ctx, None, "ABกข-")
+    snapshot = stats.stats()
+    assert not any(snapshot["stages"].values())
+    assert snapshot["timers"] == {} and snapshot["loads"] == []
+
+
+def test_stage_counts(offline_ctx, enabled_stats):
+    offline_ctx.math = make_info("math", {0x2211: 7})
+    user = make_info("user", {0x31: 1})
+    # 1: 用户字体；A: 脚本字体；B: 沿用上一段；∑: math 槽位；-: 都没有；第二个 A 没走沿用
+    runs = picker.fz_encode_string_with_system_font(offline_ctx, user, "1AB∑-1A")
+    assert [run.font.name if run.font else None for run in runs] == [
+        "user",
+        "latin",
+        "math",
+        None,
+        "user",
+        "latin",
+    ]
+    stages = stats.stats()["stages"]
+    assert stages["user"] == 2
+    assert stages["script"] == 1 and stages["run"] == 1
+    assert stages["math"] == 1 and stages["miss"] == 1
+    assert stages["memo"] == 1
+
+    offline_ctx.clear_memo()
+    picker.fz_encode_character_with_system_font(offline_ctx, None, ord("-"))
+    assert stats.stats()["stages"]["negative"] == 1
+
+
+def test_load_records_and_caches(tmp_path: Path, monkeypatch, enabled_stats):
+    latin = build_font(tmp_path / "Latin-Regular.ttf", family="Latin")
+    info.clear_caches()
+    backend = fake_backend(lambda script: latin if script == "Latn" else None)
+    monkeypatch.setattr(picker, "backend", lambda: backend)
+
+    ctx = FontContext()
+    picker.fz_encode_string_with_system_font(ctx, None, "HELLO")
+    snapshot = stats.stats(ctx)
+
+    (load,) = snapshot["loads"]
+    assert load["path"] == str(latin)
+    assert load["bytes"] == latin.stat().st_size
+    assert load["purpose"] == "script Latn"
+    assert snapshot["timers"]["load"]["count"] == 1
+    assert snapshot["caches"]["info._load_font_info"]["misses"] >= 1
+    assert snapshot["context"]["memo_misses"] == 1
+    json.dumps(snapshot)
+
+
+def test_enumerator_probes(font_dir: Path, enabled_stats):
+    from fontmod.enumerator import FontEnumerator
+
+    info.clear_caches()
+    FontEnumerator(dirs=[font_dir], use_cache=False)
+    snapshot = stats.stats()
+
+    assert snapshot["timers"]["scan"]["count"] == 1
+    assert snapshot["timers"]["parse"]["count"] == 2
+    loads = {Path(load["path"]).name: load for load in snapshot["loads"]}
+    assert set(loads) == {"TestSans-Regular.ttf", "TestSans-Bold.ttf"}
+    for load in loads.values():
+        assert load["purpose"] == "enumerate"
+        assert load["bytes"] == Path(load["path"]).stat().st_size
@@ -0,0 +1,46 @@
+import pytest
+
+from conftest import make_info
+from fontmod import vector
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_matches_per_codepoint(offline_ctx, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(vector, "np", None)
+
+    user = make_info("user", {0x41: 7, 0x4E00: 9})
+    text = "ABกข-Z一A"
+    font_ids, gids, fonts = vector.encode_codepoints(
+        offline_ctx, user, [ord(ch) for ch in text]
+    )
+    latin = offline_ctx.fallback["Latn"]
+    thai = offline_ctx.fallback["Thai"]
+    assert [fonts[i] if i >= 0 else None for i in font_ids] == [
+        user,
+        latin,
+        thai,
+        thai,
+        None,
+        latin,
+        user,
+        user,
+    ]
+    assert list(gids) == [7, 2, 1, 2, 0, 26, 9, 7]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_out_of_range_codepoints(offline_ctx, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(vector, "np", None)
+
+    font_ids, gids, fonts = vector.encode_codepoints(
+        offline_ctx, None, [0x41, 0x110000, 0xFFFFFFFF]
+    )
+    assert list(font_ids) == [0, -1, -1]
+    assert list(gids) == [1, 0, 0]
+    assert fonts == [offline_ctx.fallback["Latn"]]
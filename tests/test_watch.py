@@ -0,0 +1,60 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import make_info
+from fontmod.context import FontContext
+from fontmod.enumerator import FontEnumerator
+from fontmod.synthetic import build_font
+from fontmod.watch import FontWatcher
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_poll_updates_index_and_invalidates_context(font_dir: Path):
+    fe = FontEnumerator(dirs=[font_dir], use_cache=False)
+    bold = font_dir / "sub" / "TestSans-Bold.ttf"
+    ctx = FontContext()
+    ctx.fallback["Latn"] = fe.get_font(bold).info
+    ctx.fallback["Thai"] = make_info("thai", {0x0E01: 1})
+    ctx.mark_negative(("script", "Grek", False, False, False))
+    ctx.memo_put((0, 0x41, False, False, False), None, None)
+
+    watcher = FontWatcher(fe, [ctx], use_inotify=False)
+    assert not watcher.poll()
+
+    bold.unlink()
+    changes = watcher.poll()
+    assert [r.path for r in changes.removed] == [bold]
+    assert fe.get_font(bold) is None
+    # 只丢弃来自被删除文件的字体，其他字体保留
+    assert list(ctx.fallback) == ["Thai"]
+    assert not ctx.negative
+    assert not ctx.memo
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_background_watcher_picks_up_changes(font_dir: Path, use_inotify: bool):
+    if use_inotify and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    fe = FontEnumerator(dirs=[font_dir], use_cache=False)
+    watcher = FontWatcher(fe, interval=0.05, debounce=0.05, use_inotify=use_inotify)
+    if use_inotify and watcher.mode != "inotify":
+        pytest.skip("inotify unavailable")
+
+    with watcher:
+        added = build_font(font_dir / "sub" / "New-Regular.ttf", family="New")
+        assert _wait_for(lambda: fe.get_font_by_name("New Regular") is not None)
+        assert fe.get_font(added) is not None
+
+        added.unlink()
+        assert _wait_for(lambda: fe.get_font_by_name("New Regular") is None)